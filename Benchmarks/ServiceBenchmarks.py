@@ -0,0 +1,195 @@
+import gc
+import itertools
+import json
+import platform
+import statistics
+import sys
+import time
+import tracemalloc
+import mongomock
+from bson import ObjectId
+from flask import Flask
+from flask_jwt_extended import JWTManager
+from mongoengine import connect, disconnect
+from Modules.Auth.Services.AuthService import AuthService
+from Modules.Core.JsonSerializer import JsonSerializer
+from Modules.Core.LRUCache import LRUCache
+from Modules.Core.PasswordHasher import PasswordHasher
+from Modules.Core.RateLimiter import LoginLimiter, SlidingWindowLimiter
+from Modules.Users.Services.UserService import UserService
+from Modules.Users.User import User
+
+class ServiceBenchmarks:
+    """
+    Offline micro-benchmarks for the service layer, run against mongomock.
+    Each benchmark is a zero-argument callable executed `iterations` times;
+    latency is measured per call and allocations in a separate tracemalloc pass.
+    """
+
+    def __init__(self, iterations=200, warmup=20, alloc_iterations=50, bcrypt_rounds=4):
+        self.iterations = iterations
+        self.warmup = warmup
+        self.alloc_iterations = alloc_iterations
+        self.bcrypt_rounds = bcrypt_rounds
+        self._counter = itertools.count()
+
+    def setUp(self):
+        disconnect()
+        connect('benchmarks', host='localhost', mongo_client_class=mongomock.MongoClient)
+        User.ensure_indexes()
+        
+        self.app = Flask(__name__)
+        self.app.config['JWT_SECRET_KEY'] = 'benchmark-secret-key-of-sufficient-length'
+        JWTManager(self.app)
+        self.context = self.app.app_context()
+        self.context.push()
+        
+        self.hasher = PasswordHasher(max_workers=1, rounds=self.bcrypt_rounds)
+        unlimited = LoginLimiter(SlidingWindowLimiter(limit=10 ** 12), SlidingWindowLimiter(limit=10 ** 12))
+        self.cold_service = UserService(cache=LRUCache(max_size=0), hasher=self.hasher)
+        self.warm_service = UserService(cache=LRUCache(max_size=1024, ttl=3600), hasher=self.hasher)
+        self.auth_service = AuthService(hasher=self.hasher, limiter=unlimited)
+        
+        self.serializers = {}
+        for backend in ('compiled', 'orjson'):
+            try:
+                serializer = JsonSerializer(backend)
+            except ImportError:
+                continue
+            serializer.register_model(('_id',) + User.public_fields)
+            self.serializers[backend] = serializer
+        
+        response, _ = self.cold_service.create({'name': 'bench user', 'email': 'bench@example.com', 'password': 'password123'})
+        self.user_id = response['user']['_id']
+        self.user_response = response
+        
+        # Response shapes of GET /api/users (one full page) and POST /api/users/lookup
+        users = [
+            User.to_public_dict({'_id': ObjectId(), 'name': f'bench user {index}', 'email': f'bench{index}@example.com'})
+            for index in range(200)
+        ]
+        self.page_response = {"users": users, "next_cursor": 'WyJfaWQiLG51bGwsIjY1YTAifQ'}
+        results = [{"id": user['_id'], "status": 200, "user": user} for user in users[:90]]
+        results += [{"id": str(ObjectId()), "status": 404, "error": "User not found"} for _ in range(10)]
+        self.lookup_response = {"found": 90, "missing": 10, "results": results}
+
+    def tearDown(self):
+        self.context.pop()
+        self.hasher.shutdown()
+        disconnect()
+
+    def benchmarks(self):
+        benchmarks = {
+            "user.validate_email.valid": lambda: self.cold_service.validate_email('user.name+tag@example.co.uk'),
+            "user.validate_email.invalid": lambda: self.cold_service.validate_email('user space@example.com'),
+            "user.find_by_id.uncached": lambda: self.cold_service.find_by_id(self.user_id),
+            "user.find_by_id.cached": lambda: self.warm_service.find_by_id(self.user_id),
+            "user.create": lambda: self.cold_service.create(self._new_user()),
+            "auth.login": lambda: self.auth_service.login('bench@example.com', 'password123'),
+            "auth.register": lambda: self.auth_service.register(self._new_user()),
+        }
+        payloads = {"user": self.user_response, "page": self.page_response, "lookup": self.lookup_response}
+        for shape, payload in payloads.items():
+            benchmarks[f"json.{shape}.stdlib"] = lambda payload=payload: json.dumps(payload).encode('utf-8')
+            for backend, serializer in self.serializers.items():
+                benchmarks[f"json.{shape}.{backend}"] = (
+                    lambda serializer=serializer, payload=payload: serializer.dumps(payload))
+        return benchmarks
+
+    def run(self, selected=None):
+        self.setUp()
+        try:
+            results = {}
+            for name, fn in self.benchmarks().items():
+                if selected and not any(pattern in name for pattern in selected):
+                    continue
+                results[name] = self.measure(fn)
+            return {"environment": self.environment(), "results": results}
+        finally:
+            self.tearDown()
+
+    def measure(self, fn):
+        for _ in range(self.warmup):
+            fn()
+        
+        gc.collect()
+        gc_was_enabled = gc.isenabled()
+        gc.disable()
+        try:
+            samples = []
+            for _ in range(self.iterations):
+                started_at = time.perf_counter_ns()
+                fn()
+                samples.append(time.perf_counter_ns() - started_at)
+        finally:
+            if gc_was_enabled:
+                gc.enable()
+        
+        tracemalloc.start()
+        try:
+            peaks = []
+            for _ in range(self.alloc_iterations):
+                baseline, _ = tracemalloc.get_traced_memory()
+                tracemalloc.reset_peak()
+                fn()
+                _, peak = tracemalloc.get_traced_memory()
+                peaks.append(peak - baseline)
+        finally:
+            tracemalloc.stop()
+        
+        samples.sort()
+        return {
+            "iterations": self.iterations,
+            "min_us": samples[0] / 1000,
+            "p50_us": self._percentile(samples, 50) / 1000,
+            "p90_us": self._percentile(samples, 90) / 1000,
+            "p99_us": self._percentile(samples, 99) / 1000,
+            "max_us": samples[-1] / 1000,
+            "mean_us": statistics.fmean(samples) / 1000,
+            "stdev_us": (statistics.stdev(samples) if len(samples) > 1 else 0) / 1000,
+            "alloc_peak_bytes": statistics.median(peaks)
+        }
+
+    def environment(self):
+        return {
+            "python": sys.version.split()[0],
+            "implementation": platform.python_implementation(),
+            "platform": platform.platform(),
+            "machine": platform.machine(),
+            "bcrypt_rounds": self.bcrypt_rounds,
+            "iterations": self.iterations
+        }
+
+    def _new_user(self):
+        index = next(self._counter)
+        return {'name': f'bench user {index}', 'email': f'bench{index}@example.com', 'password': 'password123'}
+
+    @staticmethod
+    def _percentile(sorted_samples, percentile):
+        index = min(len(sorted_samples) - 1, int(round(percentile / 100 * (len(sorted_samples) - 1))))
+        return sorted_samples[index]
+
+def compare(current, baseline, threshold=0.10, metrics=("p50_us",)):
+    """
+    Compare two result sets and return a list of regressions, each a dict with
+    the benchmark, metric, baseline and current values and the relative change.
+    """
+    regressions = []
+    for name, result in current["results"].items():
+        previous = baseline.get("results", {}).get(name)
+        if previous is None:
+            continue
+        for metric in metrics:
+            before, after = previous.get(metric), result.get(metric)
+            if not before or after is None:
+                continue
+            change = (after - before) / before
+            if change > threshold:
+                regressions.append({
+                    "benchmark": name,
+                    "metric": metric,
+                    "baseline": before,
+                    "current": after,
+                    "change": change
+                })
+    return regressions
@@ -0,0 +1,13 @@
+from abc import ABC, abstractmethod
+
+class AsyncAuthContract(ABC):
+    
+    @abstractmethod
+    async def login(self, email, password, client_ip=None):
+        """Authenticate a user with email and password"""
+        pass
+    
+    @abstractmethod
+    async def register(self, user_data):
+        """Register a new user"""
+        pass
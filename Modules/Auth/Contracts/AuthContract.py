@@ -3,7 +3,7 @@ from abc import ABC, abstractmethod
 class AuthContract(ABC):
     
     @abstractmethod
-    def login(self, email, password):
+    def login(self, email, password, client_ip=None):
         """Authenticate a user with email and password"""
         pass
     
@@ -1,7 +1,7 @@
 from flask import request
 from flask_restx import Namespace, Resource, fields
-from ..Services.AuthService import AuthService
 
+# Services are imported inside the handlers so Mongo and bcrypt stay out of cold start
 auth_ns = Namespace('auth', description='Authentication operations')
 
 # Define models for Swagger
@@ -35,11 +35,16 @@ class Login(Resource):
     @auth_ns.expect(login_model)
     @auth_ns.response(200, 'Login successful', auth_response)
     @auth_ns.response(401, 'Invalid credentials', error_model)
+    @auth_ns.response(429, 'Too many login attempts', error_model)
     def post(self):
         """Log in an existing user"""
         data = request.get_json()
+        from ..Services.AuthService import AuthService
         auth_service = AuthService()
-        return auth_service.login(data.get('email'), data.get('password'))
+        response, status_code = auth_service.login(data.get('email'), data.get('password'), request.remote_addr)
+        if status_code == 429:
+            return response, status_code, {'Retry-After': str(response['retry_after'])}
+        return response, status_code
 
 @auth_ns.route('/register')
 class Register(Resource):
@@ -50,5 +55,6 @@ class Register(Resource):
     def post(self):
         """Register a new user"""
         data = request.get_json()
+        from ..Services.AuthService import AuthService
         auth_service = AuthService()
         return auth_service.register(data) 
\ No newline at end of file
@@ -0,0 +1,70 @@
+from ..Contracts.AsyncAuthContract import AsyncAuthContract
+from .AuthValidation import AuthValidation
+from .TokenService import TokenService
+from Modules.Users.User import User
+from Modules.Users.Services.AsyncUserService import AsyncUserService
+from Modules.Core.PasswordHasher import password_hasher, HashingQueueFull
+from Modules.Core.RateLimiter import login_limiter
+import asyncio
+
+class AsyncAuthService(AuthValidation, AsyncAuthContract):
+    """Async counterpart of AuthService used by the ASGI serving mode"""
+
+    def __init__(self, user_service=None, token_service=None, hasher=None, limiter=None):
+        self.hasher = hasher if hasher is not None else password_hasher
+        self.login_limiter = limiter if limiter is not None else login_limiter
+        self.user_service = user_service if user_service is not None else AsyncUserService(hasher=self.hasher)
+        self.token_service = token_service if token_service is not None else TokenService()
+        self._background = set()
+
+    async def login(self, email, password, client_ip=None):
+        try:
+            error = self.validate_credentials(email, password)
+            if error:
+                return {"error": error}, 400
+            
+            throttled = self.throttle_login(email, client_ip)
+            if throttled:
+                return throttled
+            
+            user = await self.user_service.collection.find_one(self.login_query(email), User.public_projection('password'))
+            if user is None:
+                return {"error": "Invalid credentials"}, 401
+            
+            if not await self.hasher.check_async(password, user['password']):
+                return {"error": "Invalid credentials"}, 401
+            
+            # Migrate hashes made with a different cost, off the response path
+            if self.hasher.needs_rehash(user['password']):
+                task = asyncio.create_task(self._upgrade_password_hash(user, password))
+                self._background.add(task)
+                task.add_done_callback(self._background.discard)
+            
+            return self.login_response(user, self.token_service.create_access_token), 200
+        except HashingQueueFull:
+            return {"error": "Server busy, retry later"}, 503
+        except Exception as e:
+            return {"error": str(e)}, 500
+
+    async def _upgrade_password_hash(self, raw_user, password):
+        try:
+            new_hash = await self.hasher.hash_async(password)
+            await self.user_service.collection.update_one(*self.password_update(raw_user, new_hash))
+        except Exception:
+            # Best effort: the old hash stays valid and is retried on the next login
+            pass
+
+    async def register(self, user_data):
+        try:
+            error = self.validate_registration(user_data)
+            if error:
+                return {"error": error}, 400
+            
+            response, status_code = await self.user_service.create(user_data)
+            if status_code != 201:
+                return response, status_code
+            
+            response['access_token'] = self.token_service.create_access_token(identity=response['user']['_id'])
+            return response, 201
+        except Exception as e:
+            return {"error": str(e)}, 500
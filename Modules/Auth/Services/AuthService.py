@@ -1,54 +1,65 @@
 from ..Contracts.AuthContract import AuthContract
+from .AuthValidation import AuthValidation
 from flask_jwt_extended import create_access_token
 from Modules.Users.User import User
 from Modules.Users.Services.UserService import UserService
+from Modules.Core.PasswordHasher import password_hasher, HashingQueueFull
+from Modules.Core.RateLimiter import login_limiter
+from Modules.Core.Metrics import stage, timed_service
 from mongoengine.errors import NotUniqueError
-import bcrypt
 
-class AuthService(AuthContract):
+class AuthService(AuthValidation, AuthContract):
     
-    def __init__(self):
-        self.user_service = UserService()
+    def __init__(self, hasher=None, limiter=None):
+        self.hasher = hasher if hasher is not None else password_hasher
+        self.login_limiter = limiter if limiter is not None else login_limiter
+        self.user_service = UserService(hasher=self.hasher)
     
-    def login(self, email, password):
+    @timed_service
+    def login(self, email, password, client_ip=None):
         """
         Authenticate a user with email and password
         Returns access token if authentication is successful
         """
         try:
-            if not email or not password:
-                return {"error": "Email and password are required"}, 400
-                
-            user = User.objects.get(email=email)
+            error = self.validate_credentials(email, password)
+            if error:
+                return {"error": error}, 400
+
+            # Shed brute-force traffic before any DB lookup or hash check
+            throttled = self.throttle_login(email, client_ip)
+            if throttled:
+                return throttled
+
+            # Lean read: only the public fields plus the hash needed for verification
+            with stage('database'):
+                user = User._get_collection().find_one(self.login_query(email), User.public_projection('password'))
+            if user is None:
+                return {"error": "Invalid credentials"}, 401
             
-            # Verify password with bcrypt
-            if not bcrypt.checkpw(password.encode('utf-8'), user.password.encode('utf-8')):
+            # Verify password with bcrypt on the dedicated hashing pool
+            if not self.hasher.check(password, user['password']):
                 return {"error": "Invalid credentials"}, 401
             
-            access_token = create_access_token(identity=str(user.id))
+            # Migrate hashes made with a different cost than the configured one
+            self.upgrade_password_hash(user, password)
             
-            return {
-                "access_token": access_token,
-                "user": {
-                    "id": str(user.id),
-                    "name": user.name,
-                    "email": user.email
-                }
-            }, 200
+            return self.login_response(user, create_access_token), 200
             
-        except User.DoesNotExist:
-            return {"error": "Invalid credentials"}, 401
+        except HashingQueueFull:
+            return {"error": "Server busy, retry later"}, 503
         except Exception as e:
             return {"error": str(e)}, 500
     
+    @timed_service
     def register(self, user_data):
         """
         Register a new user using UserService for user creation
         """
         try:
-            # Validate all required fields
-            if not user_data.get('name') or not user_data.get('email') or not user_data.get('password'):
-                return {"error": "Name, email, and password are required"}, 400
+            error = self.validate_registration(user_data)
+            if error:
+                return {"error": error}, 400
             
             # Use UserService to create the user with password
             response, status_code = self.user_service.create(user_data)
@@ -59,7 +70,8 @@ class AuthService(AuthContract):
                 
             # Generate token
             user_id = response['user']['_id']
-            access_token = create_access_token(identity=user_id)
+            with stage('token'):
+                access_token = create_access_token(identity=user_id)
             
             # Add token to response
             response['access_token'] = access_token
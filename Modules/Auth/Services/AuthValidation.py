@@ -0,0 +1,71 @@
+from Modules.Users.User import User
+from Modules.Core.Metrics import stage
+
+class AuthValidation:
+    """
+    Validation and response shaping shared by the sync and async auth services.
+    Expects the host class to provide `login_limiter` and `hasher` attributes.
+    """
+
+    def validate_credentials(self, email, password):
+        if not email or not password:
+            return "Email and password are required"
+        if not isinstance(email, str) or not isinstance(password, str):
+            return "Email and password must be strings"
+        return None
+
+    def throttle_login(self, email, client_ip=None):
+        """Return a 429 response when the email or client IP is over its limit, else None"""
+        # Every casing of an address shares one budget, as it shares one account
+        allowed, retry_after = self.login_limiter.check(User.email_key_for(email), client_ip)
+        if allowed:
+            return None
+        return {"error": "Too many login attempts, retry later", "retry_after": retry_after}, 429
+
+    def login_query(self, email):
+        """
+        Look users up by canonical email key, so any casing of the address
+        matches; documents the backfill hasn't reached match on the exact email
+        """
+        return {'$or': [
+            {'email_key': User.email_key_for(email)},
+            {'email': email, 'email_key': {'$exists': False}}
+        ]}
+
+    def upgrade_password_hash(self, raw_user, password):
+        """
+        After a successful check, re-hash passwords stored with a stale cost.
+        Runs in the background; the update is conditional on the old hash so a
+        concurrent password change is never overwritten.
+        """
+        if not self.hasher.needs_rehash(raw_user['password']):
+            return None
+        
+        def store(new_hash):
+            User._get_collection().update_one(*self.password_update(raw_user, new_hash))
+        
+        return self.hasher.rehash_in_background(password, store)
+
+    def password_update(self, raw_user, new_hash):
+        """(filter, update) pair replacing a stored hash only if it is still the one we checked"""
+        return (
+            {'_id': raw_user['_id'], 'password': raw_user['password']},
+            {'$set': {'password': new_hash}}
+        )
+
+    def validate_registration(self, user_data):
+        # Validate all required fields
+        if not user_data.get('name') or not user_data.get('email') or not user_data.get('password'):
+            return "Name, email, and password are required"
+        return None
+
+    def login_response(self, raw_user, create_token):
+        """Build the login payload from a raw user document, without the password"""
+        user_dict = User.to_public_dict(raw_user)
+        user_id = user_dict.pop('_id')
+        with stage('token'):
+            access_token = create_token(identity=user_id)
+        return {
+            "access_token": access_token,
+            "user": {"id": user_id, **user_dict}
+        }
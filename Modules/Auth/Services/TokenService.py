@@ -0,0 +1,37 @@
+from datetime import datetime, timedelta, timezone
+import os
+import uuid
+import jwt
+
+class TokenService:
+    """
+    Issues and verifies access tokens outside a Flask app context.
+    Tokens carry the same claims as flask_jwt_extended's, so they are
+    accepted by both the sync and the async serving modes.
+    """
+
+    algorithm = 'HS256'
+
+    def __init__(self, secret_key=None, expires_delta=timedelta(hours=1)):
+        self.secret_key = secret_key or os.getenv('JWT_SECRET_KEY', 'super-secret-key')
+        self.expires_delta = expires_delta
+
+    def create_access_token(self, identity):
+        now = datetime.now(timezone.utc)
+        claims = {
+            "fresh": False,
+            "iat": now,
+            "jti": str(uuid.uuid4()),
+            "type": "access",
+            "sub": identity,
+            "nbf": now,
+            "exp": now + self.expires_delta
+        }
+        return jwt.encode(claims, self.secret_key, self.algorithm)
+
+    def decode_access_token(self, token):
+        """Return the verified claims, raising jwt.InvalidTokenError on any failure"""
+        claims = jwt.decode(token, self.secret_key, algorithms=[self.algorithm], options={"require": ["exp", "sub"]})
+        if claims.get('type') != 'access':
+            raise jwt.InvalidTokenError("Only access tokens are allowed")
+        return claims
@@ -0,0 +1,31 @@
+from pymongo import AsyncMongoClient
+import os
+
+_client = None
+
+def get_async_client():
+    """Lazily create the process-wide async Mongo client"""
+    global _client
+    if _client is None:
+        from .Database import connection_settings
+        _client = AsyncMongoClient(**connection_settings())
+    return _client
+
+def get_async_collection(name):
+    # Same database resolution as mongoengine.connect: the one in the URI, else 'test'
+    database = get_async_client().get_default_database(default='test')
+    return database[name]
+
+def _reset_after_fork():
+    # Clients are not fork-safe: the child builds its own on first use
+    global _client
+    _client = None
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_reset_after_fork)
+
+async def close_async_client():
+    global _client
+    if _client is not None:
+        await _client.close()
+        _client = None
@@ -0,0 +1,51 @@
+from threading import Lock
+import hashlib
+import math
+
+class BloomFilter:
+    """
+    Fixed-size Bloom filter over strings.
+    `item in filter` is False only for items that were never added; True means
+    "maybe added", wrong with probability ~error_rate while count <= capacity.
+    """
+
+    def __init__(self, capacity=1000000, error_rate=0.01):
+        capacity = max(1, int(capacity))
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.size = max(8, math.ceil(-capacity * math.log(error_rate) / (math.log(2) ** 2)))
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self._bits = bytearray((self.size + 7) // 8)
+        self._lock = Lock()
+        self.count = 0
+
+    def _positions(self, item):
+        # Double hashing (Kirsch-Mitzenmacher): k positions from one 128-bit digest
+        digest = hashlib.blake2b(item.encode('utf-8'), digest_size=16).digest()
+        first = int.from_bytes(digest[:8], 'little')
+        second = int.from_bytes(digest[8:], 'little') | 1
+        return [(first + i * second) % self.size for i in range(self.hashes)]
+
+    def add(self, item):
+        positions = self._positions(item)
+        with self._lock:
+            for position in positions:
+                self._bits[position >> 3] |= 1 << (position & 7)
+            self.count += 1
+
+    def __contains__(self, item):
+        bits = self._bits
+        return all(bits[position >> 3] & (1 << (position & 7)) for position in self._positions(item))
+
+    def clear(self):
+        with self._lock:
+            self._bits = bytearray(len(self._bits))
+            self.count = 0
+
+    def stats(self):
+        return {
+            "capacity": self.capacity,
+            "count": self.count,
+            "size_bytes": len(self._bits),
+            "hashes": self.hashes
+        }
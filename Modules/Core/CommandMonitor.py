@@ -0,0 +1,112 @@
+from pymongo import monitoring
+from .Metrics import current_endpoint, registry
+import json
+import logging
+import os
+
+slow_query_logger = logging.getLogger('omninext.slow_query')
+
+command_duration = registry.histogram(
+    'omninext_mongo_command_duration_seconds', 'Mongo command latency by command and collection', ('command', 'collection'))
+command_failures = registry.counter(
+    'omninext_mongo_command_failures_total', 'Failed Mongo commands by command and collection', ('command', 'collection'))
+slow_commands = registry.counter(
+    'omninext_mongo_slow_commands_total', 'Mongo commands over the slow-query threshold by endpoint', ('endpoint', 'command', 'collection'))
+
+# Commands whose first field is not a collection name
+_COLLECTION_FIELDS = {'getMore': 'collection'}
+
+def command_monitoring_enabled():
+    return os.getenv('MONGO_COMMAND_MONITORING', 'on').lower() in ('on', '1', 'true', 'yes')
+
+def redact(value):
+    """Keep the shape of a filter (keys and operators), replace every value with '?'"""
+    if isinstance(value, dict):
+        return {key: redact(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        # $or/$and branches and pipelines keep their structure, scalar lists collapse
+        shapes = [redact(item) for item in value if isinstance(item, (dict, list, tuple))]
+        return shapes if shapes else '?'
+    return '?'
+
+def command_shape(command_name, command):
+    """Redacted filter (and sort) of the commands that select documents"""
+    shape = {}
+    if command_name in ('find', 'count', 'distinct', 'findAndModify'):
+        query = command.get('filter', command.get('query'))
+        if query is not None:
+            shape['filter'] = redact(query)
+        if command.get('sort'):
+            shape['sort'] = dict(command['sort'])
+    elif command_name in ('update', 'delete'):
+        statements = command.get('updates' if command_name == 'update' else 'deletes') or []
+        if statements:
+            shape['filter'] = redact(statements[0].get('q', {}))
+            shape['statements'] = len(statements)
+    elif command_name == 'aggregate':
+        shape['pipeline'] = redact(command.get('pipeline', []))
+    elif command_name == 'insert':
+        shape['documents'] = len(command.get('documents') or [])
+    return shape
+
+class CommandMonitor(monitoring.CommandListener):
+    """
+    Driver listener timing every command by operation and collection.
+    Commands slower than the threshold are logged as one JSON record with
+    the redacted filter shape and the route that issued them.
+    """
+
+    def __init__(self, slow_threshold_ms=None, logger=None):
+        if slow_threshold_ms is None:
+            slow_threshold_ms = float(os.getenv('MONGO_SLOW_QUERY_MS', 100))
+        self.slow_threshold = slow_threshold_ms / 1000
+        self.logger = logger if logger is not None else slow_query_logger
+        self._pending = {}
+
+    def started(self, event):
+        command = event.command
+        field = _COLLECTION_FIELDS.get(event.command_name, event.command_name)
+        collection = command.get(field)
+        self._pending[(event.connection_id, event.request_id)] = (
+            collection if isinstance(collection, str) else '',
+            current_endpoint.get(),
+            command
+        )
+
+    def succeeded(self, event):
+        self._finish(event, failed=False)
+
+    def failed(self, event):
+        self._finish(event, failed=True)
+
+    def _finish(self, event, failed):
+        pending = self._pending.pop((event.connection_id, event.request_id), None)
+        if pending is None:
+            return
+        collection, endpoint, command = pending
+        duration = event.duration_micros / 1000000
+        command_duration.observe(duration, event.command_name, collection)
+        if failed:
+            command_failures.inc(event.command_name, collection)
+        if duration < self.slow_threshold:
+            return
+        slow_commands.inc(endpoint, event.command_name, collection)
+        self.logger.warning(json.dumps({
+            "event": "slow_query",
+            "endpoint": endpoint,
+            "database": event.database_name,
+            "collection": collection,
+            "command": event.command_name,
+            "duration_ms": round(duration * 1000, 3),
+            "failed": failed,
+            "shape": command_shape(event.command_name, command)
+        }, default=str))
+
+_monitor = None
+
+def get_monitor():
+    """Process-wide listener passed to every Mongo client (sync and async)"""
+    global _monitor
+    if _monitor is None:
+        _monitor = CommandMonitor()
+    return _monitor
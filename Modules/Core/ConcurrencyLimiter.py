@@ -0,0 +1,164 @@
+from threading import Lock
+import math
+import os
+import time
+
+class AdaptiveLimiter:
+    """
+    AIMD concurrency limit for one budget of routes.
+    Every request that finishes under the target latency grows the limit by
+    about one per `limit` requests (additive increase); a slow or failed
+    request shrinks it by `backoff` (multiplicative decrease). Requests over
+    the current limit are rejected right away instead of queueing.
+    """
+
+    def __init__(self, name, initial_limit=20, min_limit=1, max_limit=200,
+                 target_latency=0.1, backoff=0.9, retry_after=1):
+        self.name = name
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.target_latency = target_latency
+        self.backoff = backoff
+        self.retry_after = retry_after
+        self._limit = float(max(min_limit, min(initial_limit, max_limit)))
+        self._lock = Lock()
+        self.in_flight = 0
+        self.accepted = 0
+        self.rejected = 0
+
+    @property
+    def limit(self):
+        return int(self._limit)
+
+    def try_acquire(self):
+        with self._lock:
+            if self.in_flight >= int(self._limit):
+                self.rejected += 1
+                return False
+            self.in_flight += 1
+            self.accepted += 1
+            return True
+
+    def release(self, latency, failed=False):
+        with self._lock:
+            self.in_flight -= 1
+            if failed or latency > self.target_latency:
+                self._limit = max(self.min_limit, self._limit * self.backoff)
+            else:
+                self._limit = min(self.max_limit, self._limit + 1 / self._limit)
+
+    def stats(self):
+        with self._lock:
+            return {
+                "limit": int(self._limit),
+                "in_flight": self.in_flight,
+                "accepted": self.accepted,
+                "rejected": self.rejected
+            }
+
+    def collect(self):
+        """Prometheus exposition lines for MetricsRegistry.register_collector"""
+        stats = self.stats()
+        label = '{budget="' + self.name + '"}'
+        return [
+            f'omninext_concurrency_limit{label} {stats["limit"]}',
+            f'omninext_concurrency_in_flight{label} {stats["in_flight"]}',
+            f'omninext_concurrency_accepted_total{label} {stats["accepted"]}',
+            f'omninext_concurrency_rejected_total{label} {stats["rejected"]}'
+        ]
+
+# Route templates per budget: bcrypt-bound writes can't starve the cheap reads.
+# Routes not listed (metrics, docs, the streaming export) are not limited.
+ROUTE_BUDGETS = {
+    '/api/auth/login': 'auth',
+    '/api/auth/register': 'auth',
+    '/api/users/create': 'auth',
+    '/api/users/bulk': 'bulk',
+    '/api/users': 'users',
+    '/api/users/<string:user_id>': 'users',
+    '/api/users/lookup': 'users'
+}
+
+# `reserve`: worker threads the budget always leaves to the others. A bcrypt
+# burst admitted on every gthread thread would queue the reads behind it in
+# the socket backlog, where their own budget can't shed or serve them.
+BUDGET_DEFAULTS = {
+    'auth': {'initial': 8, 'min': 1, 'max': 64, 'target_ms': 750, 'reserve': 1},
+    # A full batch hashes USER_BULK_MAX passwords: its target is a request
+    # timeout, not a login, so batches don't shrink the auth budget
+    'bulk': {'initial': 1, 'min': 1, 'max': 2, 'target_ms': 20000, 'reserve': 1},
+    'users': {'initial': 50, 'min': 4, 'max': 500, 'target_ms': 100}
+}
+
+def concurrency_limit_enabled():
+    return os.getenv('CONCURRENCY_LIMIT', 'on').lower() in ('on', '1', 'true', 'yes')
+
+def worker_threads():
+    """Request threads per worker as exported by ServerConfig.apply_environment, None when unknown"""
+    value = os.getenv('WEB_THREADS')
+    return max(1, int(value)) if value else None
+
+def build_limiters(threads=None):
+    """
+    One limiter per budget, tunable with CONCURRENCY_<BUDGET>_INITIAL/_MIN/_MAX/_TARGET_MS.
+    When the worker's thread count is known, a budget with a reserve is capped
+    at threads - reserve (at least 1), whatever its configured maximum.
+    """
+    threads = threads if threads is not None else worker_threads()
+    limiters = {}
+    for name, defaults in BUDGET_DEFAULTS.items():
+        prefix = f'CONCURRENCY_{name.upper()}_'
+        target_ms = float(os.getenv(prefix + 'TARGET_MS', defaults['target_ms']))
+        max_limit = int(os.getenv(prefix + 'MAX', defaults['max']))
+        if threads and defaults.get('reserve'):
+            max_limit = min(max_limit, max(1, threads - defaults['reserve']))
+        limiters[name] = AdaptiveLimiter(
+            name,
+            initial_limit=int(os.getenv(prefix + 'INITIAL', defaults['initial'])),
+            min_limit=min(int(os.getenv(prefix + 'MIN', defaults['min'])), max_limit),
+            max_limit=max_limit,
+            target_latency=target_ms / 1000,
+            retry_after=max(1, math.ceil(target_ms / 1000))
+        )
+    return limiters
+
+def init_app(app, limiters=None):
+    """Shed load per route budget with a fast 503 + Retry-After before the view runs"""
+    if not app.config.get('CONCURRENCY_LIMIT', concurrency_limit_enabled()):
+        return
+    from flask import g, jsonify, request
+    from .Metrics import registry
+
+    limiters = limiters if limiters is not None else build_limiters()
+    # Keyed by budget so a second app in the process replaces the series instead of duplicating them
+    for name, limiter in limiters.items():
+        registry.register_collector(limiter.collect, key=('concurrency', name))
+
+    @app.before_request
+    def acquire_concurrency_slot():
+        budget = ROUTE_BUDGETS.get(request.url_rule.rule) if request.url_rule else None
+        if budget is None:
+            return None
+        limiter = limiters[budget]
+        if not limiter.try_acquire():
+            response = jsonify({"error": "Server busy, retry later"})
+            response.status_code = 503
+            response.headers['Retry-After'] = str(limiter.retry_after)
+            return response
+        g._concurrency_slot = (limiter, time.perf_counter())
+        return None
+
+    @app.after_request
+    def record_concurrency_status(response):
+        if '_concurrency_slot' in g:
+            g._concurrency_failed = response.status_code >= 500
+        return response
+
+    @app.teardown_request
+    def release_concurrency_slot(exception=None):
+        slot = g.pop('_concurrency_slot', None)
+        if slot is None:
+            return
+        limiter, started_at = slot
+        failed = exception is not None or g.pop('_concurrency_failed', False)
+        limiter.release(time.perf_counter() - started_at, failed)
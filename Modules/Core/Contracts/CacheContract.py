@@ -0,0 +1,28 @@
+from abc import ABC, abstractmethod
+
+class CacheContract(ABC):
+
+    @abstractmethod
+    def get(self, key):
+        """Return the cached value for key, or None on a miss"""
+        pass
+
+    @abstractmethod
+    def set(self, key, value):
+        """Store value under key"""
+        pass
+
+    @abstractmethod
+    def delete(self, key):
+        """Remove key from the cache if present"""
+        pass
+
+    @abstractmethod
+    def clear(self):
+        """Remove every entry from the cache"""
+        pass
+
+    @abstractmethod
+    def stats(self):
+        """Return a dict of cache counters"""
+        pass
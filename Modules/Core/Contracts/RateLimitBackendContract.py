@@ -0,0 +1,16 @@
+from abc import ABC, abstractmethod
+
+class RateLimitBackendContract(ABC):
+
+    @abstractmethod
+    def increment(self, key, window_index, window):
+        """
+        Count one hit for key in the fixed window window_index.
+        Returns (current_window_count, previous_window_count)
+        """
+        pass
+
+    @abstractmethod
+    def stats(self):
+        """Return a dict of backend counters"""
+        pass
@@ -0,0 +1,94 @@
+from threading import Lock
+import logging
+import os
+
+logger = logging.getLogger(__name__)
+
+_lock = Lock()
+_connected = False
+_warmed_up = False
+
+def connection_settings():
+    """Connection pool and timeout options, read from the environment"""
+    settings = {
+        'host': os.getenv('MONGO_URI'),
+        'maxPoolSize': int(os.getenv('MONGO_MAX_POOL_SIZE', 100)),
+        'minPoolSize': int(os.getenv('MONGO_MIN_POOL_SIZE', 0)),
+        'maxIdleTimeMS': int(os.getenv('MONGO_MAX_IDLE_TIME_MS', 300000)),
+        'connectTimeoutMS': int(os.getenv('MONGO_CONNECT_TIMEOUT_MS', 5000)),
+        'serverSelectionTimeoutMS': int(os.getenv('MONGO_SERVER_SELECTION_TIMEOUT_MS', 5000)),
+        'waitQueueTimeoutMS': int(os.getenv('MONGO_WAIT_QUEUE_TIMEOUT_MS', 2000))
+    }
+    if os.getenv('MONGO_SOCKET_TIMEOUT_MS'):
+        settings['socketTimeoutMS'] = int(os.getenv('MONGO_SOCKET_TIMEOUT_MS'))
+    # Per-command timings and the slow-query log (imported here: pymongo stays out of cold start)
+    from .CommandMonitor import command_monitoring_enabled, get_monitor
+    if command_monitoring_enabled():
+        settings['event_listeners'] = [get_monitor()]
+    return settings
+
+def warmup_enabled():
+    return os.getenv('MONGO_WARMUP', '').lower() in ('1', 'true', 'yes')
+
+def ensure_connected():
+    """
+    Register the default connection on first use.
+    connect=False keeps pymongo from doing any network I/O until the first
+    operation, so importing the app never touches Mongo.
+    """
+    global _connected
+    if _connected:
+        return
+    # mongoengine/pymongo are imported on first use to keep them out of cold start
+    from mongoengine import connect
+    from mongoengine.connection import ConnectionFailure
+    with _lock:
+        if _connected:
+            return
+        try:
+            connect(alias='default', connect=False, **connection_settings())
+        except ConnectionFailure:
+            # Already registered elsewhere (tests, scripts): use it as is
+            pass
+        _connected = True
+    if warmup_enabled():
+        warmup()
+
+def warmup():
+    """
+    Open pool connections and touch the users indexes so the first requests
+    don't pay for connection setup or index metadata loading.
+    """
+    global _warmed_up
+    if _warmed_up:
+        return
+    from mongoengine.connection import get_db
+    from Modules.Users.User import User
+    
+    db = get_db()
+    db.client.admin.command('ping')
+    User._get_collection().index_information()
+    _warmed_up = True
+    logger.info("Mongo connection pool warmed up")
+
+def reset_after_fork():
+    """
+    Drop the client inherited from the parent: pymongo clients are not fork-safe.
+    The next ensure_connected() call in the child opens a fresh pool.
+    """
+    global _connected, _warmed_up, _lock
+    _lock = Lock()
+    if _connected:
+        from mongoengine import disconnect
+        disconnect(alias='default')
+    _connected = False
+    _warmed_up = False
+
+def init_app(app):
+    """Connect lazily on the first request handled by this process"""
+    app.before_request(ensure_connected)
+    if warmup_enabled():
+        ensure_connected()
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=reset_after_fork)
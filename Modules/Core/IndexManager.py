@@ -0,0 +1,73 @@
+import logging
+import os
+
+logger = logging.getLogger(__name__)
+
+def managed_documents():
+    """Documents whose indexes are created by the explicit sync step"""
+    from Modules.Users.User import User
+    return [User]
+
+def index_drift(document_cls):
+    """
+    Compare declared and existing indexes.
+    Returns {'missing': [...], 'extra': [...], 'mismatched': [...]} where
+    mismatched lists declared unique indexes that exist without the constraint.
+    """
+    drift = document_cls.compare_indexes()
+    existing = {
+        tuple(info['key']): info
+        for info in document_cls._get_collection().index_information().values()
+    }
+    mismatched = []
+    for spec in document_cls._meta.get('index_specs', []):
+        info = existing.get(tuple(spec['fields']))
+        if info is not None and bool(spec.get('unique')) != bool(info.get('unique')):
+            mismatched.append(spec['fields'])
+    drift['mismatched'] = mismatched
+    return drift
+
+def sync_indexes(drop_extra=False, check_only=False):
+    """
+    Create every declared index up front and report drift per collection.
+    Extra indexes are only dropped when drop_extra is set; mismatched ones
+    are reported, never rebuilt automatically.
+    """
+    report = {}
+    for document_cls in managed_documents():
+        collection = document_cls._get_collection()
+        drift = index_drift(document_cls)
+        if not check_only:
+            document_cls.ensure_indexes()
+            if drop_extra:
+                for info_name, info in collection.index_information().items():
+                    if info_name != '_id_' and info['key'] in drift['extra']:
+                        collection.drop_index(info_name)
+        report[collection.name] = drift
+    return report
+
+def has_drift(report):
+    return any(drift['missing'] or drift['extra'] or drift['mismatched'] for drift in report.values())
+
+def init_app(app):
+    """Register the `flask sync-indexes` command and the optional startup sync"""
+    import click
+    from . import Database
+    
+    @app.cli.command('sync-indexes')
+    @click.option('--check', is_flag=True, help='Only report drift, exit 1 if any')
+    @click.option('--drop-extra', is_flag=True, help='Drop indexes that are not declared on the models')
+    def sync_indexes_command(check, drop_extra):
+        """Create or validate all declared indexes"""
+        Database.ensure_connected()
+        report = sync_indexes(drop_extra=drop_extra, check_only=check)
+        for collection, drift in report.items():
+            click.echo(f"{collection}: missing={drift['missing']} extra={drift['extra']} mismatched={drift['mismatched']}")
+        if check and has_drift(report):
+            raise SystemExit(1)
+    
+    if os.getenv('SYNC_INDEXES_ON_STARTUP', '').lower() in ('1', 'true', 'yes'):
+        Database.ensure_connected()
+        report = sync_indexes()
+        for collection, drift in report.items():
+            logger.info("Index sync on %s: %s", collection, drift)
@@ -0,0 +1,117 @@
+from datetime import date, datetime
+from json.encoder import encode_basestring_ascii
+from bson import ObjectId
+import json
+import os
+
+try:
+    import orjson
+except ImportError:  # optional dependency
+    orjson = None
+
+def _default(obj):
+    """Types the API returns that JSON doesn't know natively"""
+    if isinstance(obj, ObjectId):
+        return str(obj)
+    if isinstance(obj, (datetime, date)):
+        return obj.isoformat()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+_fallback_encoder = json.JSONEncoder(separators=(',', ':'), default=_default)
+
+def compile_model_encoder(fields):
+    """
+    Generate an encoder for flat dicts with a fixed key order, e.g. the public
+    User representation. Keys are pre-escaped constants, so encoding is a
+    single string concatenation instead of a generic dict walk.
+    """
+    parts = []
+    for position, field in enumerate(fields):
+        key = ('{' if position == 0 else ',') + encode_basestring_ascii(field) + ':'
+        parts.append(f"{key!r} + _value(obj[{field!r}])")
+    source = "def encode(obj):\n    return " + (" + ".join(parts) if parts else "'{'") + " + '}'\n"
+    namespace = {'_value': _encode_value}
+    exec(compile(source, f"<model encoder {','.join(fields)}>", 'exec'), namespace)
+    return namespace['encode']
+
+def _encode_value(value):
+    value_type = type(value)
+    if value_type is str:
+        return encode_basestring_ascii(value)
+    if value is None:
+        return 'null'
+    if value_type is ObjectId:
+        return '"' + str(value) + '"'
+    return _fallback_encoder.encode(value)
+
+class JsonSerializer:
+    """
+    Serializes API responses to JSON bytes.
+    Uses orjson when installed; otherwise dicts shaped like a registered model,
+    at the top level or directly inside the response envelope, go through a
+    compiled per-model encoder and everything else through the C-accelerated
+    stdlib encoder.
+    ObjectId and datetimes are handled natively by both backends.
+    """
+
+    def __init__(self, backend=None):
+        backend = backend or os.getenv('JSON_BACKEND', 'auto')
+        if backend == 'auto':
+            backend = 'orjson' if orjson is not None else 'compiled'
+        if backend == 'orjson' and orjson is None:
+            raise ImportError("JSON_BACKEND=orjson requires the orjson package")
+        self.backend = backend
+        self._model_encoders = {}
+
+    def register_model(self, fields):
+        """Compile an encoder for dicts whose keys are exactly `fields`, in order"""
+        fields = tuple(fields)
+        self._model_encoders[fields] = compile_model_encoder(fields)
+
+    def dumps(self, data):
+        if self.backend == 'orjson':
+            return orjson.dumps(data, default=_default)
+        return self._encode(data).encode('utf-8')
+
+    def _encode(self, obj):
+        if type(obj) is not dict:
+            return _fallback_encoder.encode(obj)
+        encoder = self._model_encoders.get(tuple(obj))
+        if encoder is not None:
+            return encoder(obj)
+        # One level of envelope ({"user": {...}}, the login payload): model members
+        # use their compiled encoder, anything else (pages, lookup results) stays
+        # in json's C accelerator, which a Python walk over lists doesn't beat
+        return '{' + ','.join(
+            encode_basestring_ascii(str(key)) + ':' + self._encode_member(value) for key, value in obj.items()
+        ) + '}'
+
+    def _encode_member(self, value):
+        if type(value) is dict:
+            encoder = self._model_encoders.get(tuple(value))
+            if encoder is not None:
+                return encoder(value)
+        return _fallback_encoder.encode(value)
+
+def build_serializer():
+    from Modules.Users.User import User
+    serializer = JsonSerializer()
+    serializer.register_model(('_id',) + User.public_fields)
+    # The login payload names the id `id`
+    serializer.register_model(('id',) + User.public_fields)
+    return serializer
+
+def init_api(api, serializer=None):
+    """Install the serializer as the Flask-RESTX representation for application/json"""
+    from flask import make_response
+    # Built on the first response so the model import stays out of cold start
+    holder = [serializer]
+    
+    @api.representation('application/json')
+    def output_json(data, code, headers=None):
+        if holder[0] is None:
+            holder[0] = build_serializer()
+        response = make_response(holder[0].dumps(data), code)
+        response.headers.extend(headers or {})
+        response.mimetype = 'application/json'
+        return response
@@ -0,0 +1,222 @@
+from bisect import bisect_left
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import wraps
+from threading import Lock
+import time
+
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# Route template of the request being served, used to label per-stage timings
+current_endpoint = ContextVar('current_endpoint', default='none')
+# Nesting depth of timed stages, and the time spent in outermost stages of the current request
+_stage_depth = ContextVar('stage_depth', default=0)
+_request_staged = ContextVar('request_staged', default=None)
+_in_service = ContextVar('in_service', default=False)
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+def _format_labels(names, values, extra=None):
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return '{' + ','.join(pairs) + '}' if pairs else ''
+
+class Counter:
+
+    def __init__(self, name, help_text, labelnames=()):
+        self.name = name
+        self.help_text = help_text
+        self.labelnames = tuple(labelnames)
+        self._values = {}
+        self._lock = Lock()
+
+    def inc(self, *labelvalues, amount=1):
+        with self._lock:
+            self._values[labelvalues] = self._values.get(labelvalues, 0) + amount
+
+    def value(self, *labelvalues):
+        return self._values.get(labelvalues, 0)
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            items = list(self._values.items())
+        for labelvalues, value in items:
+            lines.append(f"{self.name}{_format_labels(self.labelnames, labelvalues)} {value}")
+        return lines
+
+class Histogram:
+    """Fixed-bucket histogram; observe() is a bisect and three additions under a lock"""
+
+    def __init__(self, name, help_text, labelnames=(), buckets=DEFAULT_BUCKETS):
+        self.name = name
+        self.help_text = help_text
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(sorted(buckets))
+        self._series = {}
+        self._lock = Lock()
+
+    def observe(self, value, *labelvalues):
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(labelvalues)
+            if series is None:
+                series = self._series[labelvalues] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            series[0][index] += 1
+            series[1] += value
+            series[2] += 1
+
+    def count(self, *labelvalues):
+        series = self._series.get(labelvalues)
+        return series[2] if series else 0
+
+    def total(self, *labelvalues):
+        series = self._series.get(labelvalues)
+        return series[1] if series else 0.0
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            items = [(labels, (list(series[0]), series[1], series[2])) for labels, series in self._series.items()]
+        for labelvalues, (counts, total, count) in items:
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets + (float('inf'),), counts):
+                cumulative += bucket_count
+                le = '+Inf' if bound == float('inf') else repr(bound)
+                labels = _format_labels(self.labelnames, labelvalues, f'le="{le}"')
+                lines.append(f"{self.name}_bucket{labels} {cumulative}")
+            labels = _format_labels(self.labelnames, labelvalues)
+            lines.append(f"{self.name}_sum{labels} {total}")
+            lines.append(f"{self.name}_count{labels} {count}")
+        return lines
+
+class MetricsRegistry:
+
+    def __init__(self):
+        self._metrics = []
+        self._collectors = {}
+
+    def counter(self, name, help_text, labelnames=()):
+        metric = Counter(name, help_text, labelnames)
+        self._metrics.append(metric)
+        return metric
+
+    def histogram(self, name, help_text, labelnames=(), buckets=DEFAULT_BUCKETS):
+        metric = Histogram(name, help_text, labelnames, buckets)
+        self._metrics.append(metric)
+        return metric
+
+    def register_collector(self, collector, key=None):
+        """
+        Register a callable returning extra exposition lines at scrape time.
+        A collector registered again under the same key replaces the previous one.
+        """
+        self._collectors[key if key is not None else collector] = collector
+
+    def render(self):
+        lines = []
+        for metric in self._metrics:
+            lines.extend(metric.render())
+        for collector in list(self._collectors.values()):
+            lines.extend(collector())
+        return '\n'.join(lines) + '\n'
+
+registry = MetricsRegistry()
+
+requests_total = registry.counter(
+    'omninext_requests_total', 'HTTP requests by method, endpoint and status', ('method', 'endpoint', 'status'))
+request_duration = registry.histogram(
+    'omninext_request_duration_seconds', 'HTTP request latency', ('method', 'endpoint'))
+stage_duration = registry.histogram(
+    'omninext_stage_duration_seconds', 'Latency per processing stage', ('endpoint', 'stage'))
+service_responses_total = registry.counter(
+    'omninext_service_responses_total', 'Service results by method and returned status', ('service', 'status'))
+
+@contextmanager
+def _staged():
+    """
+    Time a block; only blocks not nested in another stage add their time to
+    the request total, so the controller stage can exclude it exactly once.
+    Yields a list holding the elapsed seconds once the block exits.
+    """
+    depth_token = _stage_depth.set(_stage_depth.get() + 1)
+    started_at = time.perf_counter()
+    elapsed = [0.0]
+    try:
+        yield elapsed
+    finally:
+        elapsed[0] = time.perf_counter() - started_at
+        _stage_depth.reset(depth_token)
+        staged = _request_staged.get()
+        if staged is not None and _stage_depth.get() == 0:
+            staged[0] += elapsed[0]
+
+@contextmanager
+def stage(name):
+    """Time a block as one processing stage (service, database, hashing, token...)"""
+    with _staged() as elapsed:
+        yield
+    stage_duration.observe(elapsed[0], current_endpoint.get(), name)
+
+def timed_service(fn):
+    """
+    Decorate a service method returning a (body, status) tuple: records the
+    'service' stage and counts results by the status code the service chose.
+    A service called from another one (register -> create) is counted but
+    its time stays in the caller's stage, so the stage is observed once.
+    """
+    service_name = fn.__qualname__
+    
+    @wraps(fn)
+    def wrapper(*args, **kwargs):
+        outermost = not _in_service.get()
+        service_token = _in_service.set(True)
+        status = 500
+        try:
+            with _staged() as elapsed:
+                result = fn(*args, **kwargs)
+            if isinstance(result, tuple) and len(result) >= 2:
+                status = result[1]
+            return result
+        finally:
+            _in_service.reset(service_token)
+            if outermost:
+                stage_duration.observe(elapsed[0], current_endpoint.get(), 'service')
+            service_responses_total.inc(service_name, str(status))
+    
+    return wrapper
+
+def init_app(app, path='/metrics'):
+    """Install per-request instrumentation and the text-format scrape endpoint on a Flask app"""
+    from flask import Response, g, request
+    
+    @app.before_request
+    def start_request_timer():
+        g._metrics_started_at = time.perf_counter()
+        current_endpoint.set(request.url_rule.rule if request.url_rule else 'unmatched')
+        _request_staged.set([0.0])
+    
+    @app.after_request
+    def record_request(response):
+        started_at = g.pop('_metrics_started_at', None)
+        if started_at is not None:
+            elapsed = time.perf_counter() - started_at
+            endpoint = current_endpoint.get()
+            request_duration.observe(elapsed, request.method, endpoint)
+            # The controller stage is the request minus the stages it called
+            staged = _request_staged.get()
+            controller = elapsed - (staged[0] if staged is not None else 0.0)
+            stage_duration.observe(max(controller, 0.0), endpoint, 'controller')
+            requests_total.inc(request.method, endpoint, str(response.status_code))
+        return response
+    
+    @app.teardown_request
+    def reset_endpoint(exception=None):
+        current_endpoint.set('none')
+        _request_staged.set(None)
+    
+    @app.route(path)
+    def metrics():
+        return Response(registry.render(), mimetype='text/plain; version=0.0.4; charset=utf-8')
@@ -0,0 +1,194 @@
+from concurrent.futures import ThreadPoolExecutor
+from threading import BoundedSemaphore, Lock
+import asyncio
+import os
+import time
+import bcrypt
+from .Metrics import stage
+
+class HashingQueueFull(Exception):
+    """Raised when the hashing pool and its queue are both saturated"""
+    pass
+
+def calibrate_rounds(target_seconds, min_rounds=10, max_rounds=16):
+    """
+    Pick the highest cost whose single hash fits target_seconds on this machine.
+    Each extra round doubles the work, so one measurement at min_rounds is
+    extrapolated and then confirmed with a real hash at the chosen cost.
+    Run it once per deployment (calibrate_bcrypt.py, or the gunicorn master):
+    processes calibrating on their own can disagree and keep re-hashing.
+    """
+    sample = b'calibration-password'
+    started_at = time.perf_counter()
+    bcrypt.hashpw(sample, bcrypt.gensalt(rounds=min_rounds))
+    base = time.perf_counter() - started_at
+    
+    rounds = min_rounds
+    while rounds < max_rounds and base * 2 ** (rounds + 1 - min_rounds) <= target_seconds:
+        rounds += 1
+    while rounds > min_rounds:
+        started_at = time.perf_counter()
+        bcrypt.hashpw(sample, bcrypt.gensalt(rounds=rounds))
+        if time.perf_counter() - started_at <= target_seconds:
+            break
+        rounds -= 1
+    return rounds
+
+class PasswordHasher:
+    """
+    Runs bcrypt hashing and verification on a dedicated, bounded thread pool.
+    The bcrypt C/Rust core releases the GIL, so threads give real parallelism
+    while keeping request workers free of CPU-bound work.
+    """
+
+    def __init__(self, max_workers=None, max_queue=None, timeout=None, rounds=None):
+        self.rounds = rounds or int(os.getenv('BCRYPT_ROUNDS', 12))
+        self.max_workers = max_workers or int(os.getenv('HASH_POOL_SIZE', os.cpu_count() or 2))
+        self.max_queue = max_queue if max_queue is not None else int(os.getenv('HASH_QUEUE_DEPTH', 64))
+        self.timeout = timeout if timeout is not None else float(os.getenv('HASH_TIMEOUT', 10))
+        self._start_pool()
+        self._stats = {
+            "submitted": 0,
+            "rejected": 0,
+            "completed": 0,
+            "queue_wait_total": 0.0,
+            "queue_wait_max": 0.0,
+            "exec_total": 0.0,
+            "exec_max": 0.0
+        }
+
+    def calibrate(self, target_seconds, min_rounds=10, max_rounds=16):
+        """Set this hasher's cost with calibrate_rounds() and return it"""
+        self.rounds = calibrate_rounds(target_seconds, min_rounds, max_rounds)
+        return self.rounds
+
+    def needs_rehash(self, password_hash):
+        """True when a stored hash was made with a different cost than the configured one"""
+        try:
+            return int(password_hash.split('$')[2]) != self.rounds
+        except (AttributeError, IndexError, ValueError):
+            return False
+
+    def rehash_in_background(self, password, on_hashed):
+        """
+        Hash password off the request path and pass the new hash to on_hashed.
+        Best effort: skipped silently when the pool is saturated.
+        """
+        try:
+            future = self.submit(self._hashpw, password)
+        except HashingQueueFull:
+            return None
+        
+        def done(future):
+            if future.exception() is None:
+                on_hashed(future.result().decode('utf-8'))
+        
+        future.add_done_callback(done)
+        return future
+
+    def reset_after_fork(self):
+        """Worker threads don't survive fork(): give the child a fresh pool"""
+        self._start_pool()
+
+    def hash(self, password):
+        """Hash a plain-text password and return the bcrypt hash as a string"""
+        hashed = self._run(self._hashpw, password)
+        return hashed.decode('utf-8')
+
+    def check(self, password, password_hash):
+        """Verify a plain-text password against a stored bcrypt hash"""
+        return self._run(self._checkpw, password, password_hash)
+
+    async def hash_async(self, password):
+        """Awaitable variant of hash() for the async serving mode"""
+        hashed = await asyncio.wrap_future(self.submit(self._hashpw, password))
+        return hashed.decode('utf-8')
+
+    async def check_async(self, password, password_hash):
+        """Awaitable variant of check() for the async serving mode"""
+        return await asyncio.wrap_future(self.submit(self._checkpw, password, password_hash))
+
+    def hash_many(self, passwords):
+        """
+        Hash a batch of passwords in parallel, preserving order.
+        At most max_workers hashes of the batch are pooled at once, so the
+        queue stays free for logins and registrations arriving meanwhile;
+        slots are waited for instead of rejected, so large batches apply
+        backpressure rather than failing.
+        """
+        with stage('hashing'):
+            futures = []
+            hashes = []
+            for password in passwords:
+                if len(futures) - len(hashes) >= self.max_workers:
+                    hashes.append(futures[len(hashes)].result().decode('utf-8'))
+                futures.append(self.submit(self._hashpw, password, block=True))
+            hashes.extend(future.result().decode('utf-8') for future in futures[len(hashes):])
+            return hashes
+
+    def submit(self, fn, *args, block=False):
+        """Schedule fn on the pool, raising HashingQueueFull when saturated"""
+        if not self._slots.acquire(blocking=block):
+            with self._lock:
+                self._stats["rejected"] += 1
+            raise HashingQueueFull("Password hashing queue is full")
+        with self._lock:
+            self._stats["submitted"] += 1
+        enqueued_at = time.perf_counter()
+        try:
+            return self._executor.submit(self._timed, enqueued_at, fn, *args)
+        except Exception:
+            self._slots.release()
+            raise
+
+    def stats(self):
+        with self._lock:
+            stats = dict(self._stats)
+        completed = stats["completed"] or 1
+        stats["queue_wait_avg"] = stats["queue_wait_total"] / completed
+        stats["exec_avg"] = stats["exec_total"] / completed
+        stats["max_workers"] = self.max_workers
+        stats["max_queue"] = self.max_queue
+        stats["rounds"] = self.rounds
+        return stats
+
+    def shutdown(self, wait=True):
+        self._executor.shutdown(wait=wait)
+
+    def _start_pool(self):
+        self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='bcrypt')
+        self._slots = BoundedSemaphore(self.max_workers + self.max_queue)
+        self._lock = Lock()
+
+    def _run(self, fn, *args):
+        with stage('hashing'):
+            return self.submit(fn, *args).result(timeout=self.timeout)
+
+    def _timed(self, enqueued_at, fn, *args):
+        started_at = time.perf_counter()
+        try:
+            return fn(*args)
+        finally:
+            finished_at = time.perf_counter()
+            self._slots.release()
+            waited = started_at - enqueued_at
+            elapsed = finished_at - started_at
+            with self._lock:
+                self._stats["completed"] += 1
+                self._stats["queue_wait_total"] += waited
+                self._stats["queue_wait_max"] = max(self._stats["queue_wait_max"], waited)
+                self._stats["exec_total"] += elapsed
+                self._stats["exec_max"] = max(self._stats["exec_max"], elapsed)
+
+    def _hashpw(self, password):
+        return bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt(rounds=self.rounds))
+
+    @staticmethod
+    def _checkpw(password, password_hash):
+        return bcrypt.checkpw(password.encode('utf-8'), password_hash.encode('utf-8'))
+
+# Process-wide pool shared by UserService and AuthService
+password_hasher = PasswordHasher()
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=password_hasher.reset_after_fork)
@@ -0,0 +1,160 @@
+from collections import OrderedDict
+from threading import Lock
+import os
+import time
+from .Contracts.RateLimitBackendContract import RateLimitBackendContract
+
+class MemoryRateLimitBackend(RateLimitBackendContract):
+    """
+    In-process backend keeping two counters per key (current and previous window).
+    Memory is bounded by max_keys; keys are kept in access order so idle ones
+    are evicted from the front.
+    """
+
+    def __init__(self, max_keys=100000, clock=time.monotonic):
+        self.max_keys = max_keys
+        self.clock = clock
+        self._entries = OrderedDict()
+        self._lock = Lock()
+        self.evictions = 0
+
+    def increment(self, key, window_index, window):
+        now = self.clock()
+        with self._lock:
+            self._evict_idle(now, window)
+            entry = self._entries.get(key)
+            if entry is None:
+                current, previous = 0, 0
+            elif entry[0] == window_index:
+                current, previous = entry[1], entry[2]
+            elif entry[0] == window_index - 1:
+                current, previous = 0, entry[1]
+            else:
+                current, previous = 0, 0
+            current += 1
+            self._entries[key] = (window_index, current, previous, now)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_keys:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+            return current, previous
+
+    def stats(self):
+        with self._lock:
+            return {"keys": len(self._entries), "max_keys": self.max_keys, "evictions": self.evictions}
+
+    def _evict_idle(self, now, window, budget=8):
+        # Keys idle for two windows no longer influence any decision
+        while budget and self._entries:
+            key, entry = next(iter(self._entries.items()))
+            if now - entry[3] < 2 * window:
+                break
+            del self._entries[key]
+            self.evictions += 1
+            budget -= 1
+
+class RedisRateLimitBackend(RateLimitBackendContract):
+    """Shared backend so limits hold across workers and hosts (requires redis-py)"""
+
+    def __init__(self, url, prefix='ratelimit'):
+        import redis
+        self.client = redis.Redis.from_url(url)
+        self.prefix = prefix
+
+    def increment(self, key, window_index, window):
+        current_key = f"{self.prefix}:{key}:{window_index}"
+        previous_key = f"{self.prefix}:{key}:{window_index - 1}"
+        pipeline = self.client.pipeline()
+        pipeline.incr(current_key)
+        pipeline.expire(current_key, int(2 * window) + 1)
+        pipeline.get(previous_key)
+        current, _, previous = pipeline.execute()
+        return int(current), int(previous or 0)
+
+    def stats(self):
+        return {"backend": "redis"}
+
+class SlidingWindowLimiter:
+    """
+    Sliding-window counter: the previous fixed window is weighted by how much
+    of it still overlaps the sliding window, which approximates a true sliding
+    log with O(1) memory per key.
+    """
+
+    def __init__(self, limit, window=60.0, backend=None, clock=time.time):
+        self.limit = limit
+        self.window = window
+        self.backend = backend if backend is not None else MemoryRateLimitBackend()
+        self.clock = clock
+        self._lock = Lock()
+        self.allowed = 0
+        self.rejected = 0
+
+    def hit(self, key):
+        """
+        Record an attempt for key.
+        Returns (allowed, retry_after_seconds)
+        """
+        now = self.clock()
+        window_index = int(now // self.window)
+        elapsed = now - window_index * self.window
+        current, previous = self.backend.increment(key, window_index, self.window)
+        weighted = previous * (1 - elapsed / self.window) + current
+        allowed = weighted <= self.limit
+        with self._lock:
+            if allowed:
+                self.allowed += 1
+            else:
+                self.rejected += 1
+        if allowed:
+            return True, 0
+        return False, max(1, int(self.window - elapsed))
+
+    def stats(self):
+        with self._lock:
+            stats = {"limit": self.limit, "window": self.window, "allowed": self.allowed, "rejected": self.rejected}
+        stats.update(self.backend.stats())
+        return stats
+
+class LoginLimiter:
+    """Throttles login attempts per email and per client IP"""
+
+    def __init__(self, email_limiter, ip_limiter):
+        self.email_limiter = email_limiter
+        self.ip_limiter = ip_limiter
+
+    def check(self, email, client_ip=None):
+        """
+        Returns (allowed, retry_after_seconds).
+        `email` is used as given: callers pass the canonical key of the address.
+        """
+        if client_ip:
+            allowed, retry_after = self.ip_limiter.hit(f"ip:{client_ip}")
+            if not allowed:
+                return False, retry_after
+        if email:
+            allowed, retry_after = self.email_limiter.hit(f"email:{email}")
+            if not allowed:
+                return False, retry_after
+        return True, 0
+
+    def stats(self):
+        return {"email": self.email_limiter.stats(), "ip": self.ip_limiter.stats()}
+
+def build_login_limiter():
+    window = float(os.getenv('LOGIN_LIMIT_WINDOW', 60))
+    max_keys = int(os.getenv('LOGIN_LIMIT_MAX_KEYS', 100000))
+    redis_url = os.getenv('RATE_LIMIT_REDIS_URL')
+    
+    def backend():
+        if redis_url:
+            return RedisRateLimitBackend(redis_url, prefix='login')
+        return MemoryRateLimitBackend(max_keys=max_keys)
+    
+    return LoginLimiter(
+        email_limiter=SlidingWindowLimiter(int(os.getenv('LOGIN_LIMIT_PER_EMAIL', 10)), window, backend()),
+        ip_limiter=SlidingWindowLimiter(int(os.getenv('LOGIN_LIMIT_PER_IP', 100)), window, backend())
+    )
+
+# Process-wide login limiter shared by the sync and async auth services
+login_limiter = build_login_limiter()
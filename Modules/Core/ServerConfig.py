@@ -0,0 +1,91 @@
+import logging
+import os
+import sys
+
+logger = logging.getLogger(__name__)
+
+def _env_int(name, default):
+    value = os.getenv(name)
+    return int(value) if value else default
+
+def _env_flag(name, default):
+    return os.getenv(name, default).lower() in ('on', '1', 'true', 'yes')
+
+def server_settings(cpu_count=None):
+    """
+    Pre-fork server settings derived from the CPU count, overridable from the environment.
+    /auth requests are bcrypt-bound, so processes are sized on cores rather than
+    the usual 2 * cores + 1, and each worker gets an equal share of the cores
+    for its hashing pool; threads cover the I/O-bound Mongo reads.
+    """
+    cpu_count = cpu_count or os.cpu_count() or 1
+    workers = max(1, _env_int('WEB_WORKERS', cpu_count))
+    threads = max(1, _env_int('WEB_THREADS', 4))
+    return {
+        'bind': os.getenv('WEB_BIND', '0.0.0.0:8000'),
+        'workers': workers,
+        'threads': threads,
+        'worker_class': 'gthread' if threads > 1 else 'sync',
+        'preload_app': _env_flag('WEB_PRELOAD', 'on'),
+        'timeout': _env_int('WEB_TIMEOUT', 30),
+        'graceful_timeout': _env_int('WEB_GRACEFUL_TIMEOUT', 30),
+        'keepalive': _env_int('WEB_KEEPALIVE', 5),
+        # Count-based recycling as a backstop to the memory-based one
+        'max_requests': _env_int('WEB_MAX_REQUESTS', 0),
+        'max_requests_jitter': _env_int('WEB_MAX_REQUESTS_JITTER', 0),
+        'hash_pool_size': _env_int('HASH_POOL_SIZE', max(1, cpu_count // workers)),
+        'max_memory_growth_mb': _env_int('WEB_MAX_MEMORY_GROWTH_MB', 256)
+    }
+
+def apply_environment(settings):
+    """
+    Export the derived settings read by modules at import time (before the app is loaded).
+    WEB_THREADS caps the auth concurrency budget below the thread count (see ConcurrencyLimiter).
+    """
+    os.environ.setdefault('HASH_POOL_SIZE', str(settings['hash_pool_size']))
+    os.environ.setdefault('WEB_THREADS', str(settings['threads']))
+    calibrate_bcrypt()
+
+def calibrate_bcrypt():
+    """
+    Turn BCRYPT_TARGET_MS into BCRYPT_ROUNDS once, in the master, so every
+    forked worker hashes with the same cost. An explicit BCRYPT_ROUNDS wins.
+    """
+    target_ms = os.getenv('BCRYPT_TARGET_MS')
+    if not target_ms or os.getenv('BCRYPT_ROUNDS'):
+        return None
+    from .PasswordHasher import calibrate_rounds, password_hasher
+    rounds = calibrate_rounds(float(target_ms) / 1000)
+    os.environ['BCRYPT_ROUNDS'] = str(rounds)
+    password_hasher.rounds = rounds
+    logger.info("bcrypt calibrated to %d rounds for a %sms target", rounds, target_ms)
+    return rounds
+
+def rss_mb():
+    """Resident memory of the current process in MB"""
+    try:
+        with open('/proc/self/statm') as statm:
+            return int(statm.read().split()[1]) * os.sysconf('SC_PAGE_SIZE') / (1024 * 1024)
+    except (OSError, ValueError, IndexError):
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # Peak RSS: kilobytes on Linux, bytes on macOS
+        return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+def should_recycle(baseline_mb, current_mb, max_growth_mb):
+    return max_growth_mb > 0 and current_mb - baseline_mb > max_growth_mb
+
+def init_worker():
+    """
+    Per-worker initialization after fork. The fork hooks already dropped the
+    inherited Mongo client and hashing pool; this registers the connection
+    and starts the email filter load so the first requests don't pay for them.
+    """
+    from Modules.Core import Database
+    from Modules.Users.Services.EmailFilter import email_filter, email_filter_enabled
+    from Modules.Users.Services.UserService import user_cache
+
+    user_cache.clear()
+    Database.ensure_connected()
+    if email_filter_enabled():
+        email_filter.start_loading()
@@ -0,0 +1,99 @@
+from threading import Event, Lock
+
+class SingleFlightTimeout(Exception):
+    """Raised to a caller that waited longer than the timeout for an in-flight call"""
+    pass
+
+class _Call:
+    __slots__ = ('done', 'result', 'error')
+
+    def __init__(self):
+        self.done = Event()
+        self.result = None
+        self.error = None
+
+class SingleFlight:
+    """
+    Collapse concurrent calls sharing a key into one execution.
+    The first caller (the leader) runs the function; callers arriving while it
+    is in flight wait for its result or exception instead of running their own.
+    Nothing is cached: once the leader finishes, the next call runs again.
+    """
+
+    def __init__(self, timeout=5.0, name='default'):
+        self.timeout = timeout
+        self.name = name
+        self._calls = {}
+        self._lock = Lock()
+        self.executions = 0
+        self.coalesced = 0
+        self.errors = 0
+        self.timeouts = 0
+
+    def do(self, key, fn, *args, **kwargs):
+        with self._lock:
+            call = self._calls.get(key)
+            if call is not None:
+                self.coalesced += 1
+                leader = False
+            else:
+                call = _Call()
+                self._calls[key] = call
+                self.executions += 1
+                leader = True
+
+        if not leader:
+            if not call.done.wait(self.timeout):
+                with self._lock:
+                    self.timeouts += 1
+                raise SingleFlightTimeout(f"Timed out waiting for in-flight call {key!r}")
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn(*args, **kwargs)
+            return call.result
+        except Exception as e:
+            call.error = e
+            with self._lock:
+                self.errors += 1
+            raise
+        finally:
+            # Unregister before waking waiters so late arrivals start a fresh call
+            with self._lock:
+                self._calls.pop(key, None)
+            call.done.set()
+
+    def in_flight(self):
+        with self._lock:
+            return len(self._calls)
+
+    def stats(self):
+        with self._lock:
+            return {
+                "in_flight": len(self._calls),
+                "executions": self.executions,
+                "coalesced": self.coalesced,
+                "errors": self.errors,
+                "timeouts": self.timeouts
+            }
+
+    def collect(self):
+        """Prometheus exposition lines for MetricsRegistry.register_collector"""
+        stats = self.stats()
+        label = '{flight="' + self.name + '"}'
+        lines = []
+        for key, kind, help_text in (
+            ('executions', 'counter', 'Calls actually executed by a single-flight leader'),
+            ('coalesced', 'counter', 'Calls that waited for an in-flight identical call'),
+            ('errors', 'counter', 'Leader calls that raised'),
+            ('timeouts', 'counter', 'Waiters that gave up on an in-flight call'),
+            ('in_flight', 'gauge', 'Keys currently in flight')
+        ):
+            suffix = '_total' if kind == 'counter' else ''
+            metric = f'omninext_singleflight_{key}{suffix}'
+            lines.append(f"# HELP {metric} {help_text}")
+            lines.append(f"# TYPE {metric} {kind}")
+            lines.append(f"{metric}{label} {stats[key]}")
+        return lines
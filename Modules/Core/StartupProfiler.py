@@ -0,0 +1,22 @@
+from contextlib import contextmanager
+import time
+
+class StartupProfiler:
+    """Records how long each named initialization phase of the app takes"""
+
+    def __init__(self):
+        self.phases = {}
+
+    @contextmanager
+    def phase(self, name):
+        started_at = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phases[name] = self.phases.get(name, 0.0) + (time.perf_counter() - started_at)
+
+    def total(self):
+        return sum(self.phases.values())
+
+    def report(self):
+        return {name: round(seconds * 1000, 3) for name, seconds in self.phases.items()}
@@ -0,0 +1,86 @@
+from functools import wraps
+from flask import current_app, g, request
+from flask_jwt_extended import verify_jwt_in_request
+from .LRUCache import LRUCache
+import hashlib
+import os
+import time
+
+class VerifiedTokenCache:
+    """
+    Bounded cache of already-verified JWT claims keyed by a digest of the raw token.
+    Entries expire at the token's own `exp`, and the whole cache is flushed
+    whenever the signing secret changes.
+    """
+
+    def __init__(self, max_size=None):
+        self.cache = LRUCache(max_size=max_size or int(os.getenv('JWT_CACHE_SIZE', 10000)), ttl=0)
+        self._secret = None
+
+    def get(self, raw_token, secret):
+        self._check_secret(secret)
+        return self.cache.get(self._key(raw_token))
+
+    def set(self, raw_token, secret, jwt_header, jwt_data):
+        self._check_secret(secret)
+        exp = jwt_data.get('exp')
+        if exp is None:
+            return
+        ttl = exp - time.time()
+        if ttl > 0:
+            self.cache.set(self._key(raw_token), (jwt_header, jwt_data), ttl=ttl)
+
+    def flush(self):
+        self.cache.clear()
+
+    def stats(self):
+        return self.cache.stats()
+
+    def _check_secret(self, secret):
+        if secret != self._secret:
+            self.flush()
+            self._secret = secret
+
+    @staticmethod
+    def _key(raw_token):
+        return hashlib.sha256(raw_token.encode('utf-8')).digest()
+
+verified_token_cache = VerifiedTokenCache()
+
+def _raw_header_token():
+    header_type = current_app.config.get('JWT_HEADER_TYPE', 'Bearer')
+    header = request.headers.get(current_app.config.get('JWT_HEADER_NAME', 'Authorization'), '')
+    prefix = f"{header_type} " if header_type else ''
+    if not header.startswith(prefix):
+        return None
+    return header[len(prefix):] or None
+
+def cached_jwt_required(cache=None):
+    """
+    Drop-in replacement for flask_jwt_extended.jwt_required() for header tokens.
+    A repeat request with an already-verified token skips decoding and the
+    signature check; anything else goes through verify_jwt_in_request.
+    Not suitable together with a token blocklist, since revocation is only
+    checked on the first verification.
+    """
+    def decorator(fn):
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            token_cache = cache if cache is not None else verified_token_cache
+            secret = current_app.config.get('JWT_SECRET_KEY')
+            raw_token = _raw_header_token()
+            cached = token_cache.get(raw_token, secret) if raw_token else None
+            if cached is not None:
+                jwt_header, jwt_data = cached
+                # Same request-context state verify_jwt_in_request leaves behind
+                g._jwt_extended_jwt_user = {"loaded_user": None}
+                g._jwt_extended_jwt_header = jwt_header
+                g._jwt_extended_jwt = jwt_data
+                g._jwt_extended_jwt_location = 'headers'
+            else:
+                verified = verify_jwt_in_request()
+                if raw_token and verified:
+                    token_cache.set(raw_token, secret, *verified)
+            return current_app.ensure_sync(fn)(*args, **kwargs)
+        return wrapper
+    return decorator
@@ -0,0 +1 @@
+# Package initialization 
\ No newline at end of file
@@ -0,0 +1,64 @@
+import click
+import json
+
+def init_app(app):
+    """Register the users maintenance commands (import-users, export-users, backfill-email-keys)"""
+    # Services are imported inside the commands to keep them out of cold start
+
+    @app.cli.command('import-users')
+    @click.argument('path', type=click.Path(exists=True, dir_okay=False))
+    @click.option('--format', 'file_format', type=click.Choice(['csv', 'ndjson']), help='Defaults to the file extension')
+    @click.option('--batch-size', type=int, help='Users per insert_many batch')
+    @click.option('--workers', type=int, help='Hashing threads (defaults to the CPU count)')
+    @click.option('--checkpoint', help='Progress file used to resume, defaults to PATH.checkpoint')
+    @click.option('--rejects', help='NDJSON file receiving rejected rows, defaults to PATH.rejects')
+    def import_users_command(path, file_format, batch_size, workers, checkpoint, rejects):
+        """Stream users from a CSV or NDJSON file into the users collection"""
+        from Modules.Core import Database
+        from Modules.Core.PasswordHasher import PasswordHasher
+        from .Services.UserImporter import UserImporter
+        
+        Database.ensure_connected()
+        importer = UserImporter(
+            hasher=PasswordHasher(max_workers=workers) if workers else None,
+            batch_size=batch_size,
+            checkpoint_path=checkpoint or path + '.checkpoint',
+            rejects_path=rejects or path + '.rejects'
+        )
+        click.echo(json.dumps(importer.run(path, file_format)))
+
+    @app.cli.command('export-users')
+    @click.argument('output', default='-')
+    @click.option('--gzip', 'compress', is_flag=True, help='Gzip-compress the output')
+    @click.option('--after', help='Resume after this _id (the last one already exported)')
+    @click.option('--batch-size', type=int, help='Documents per cursor batch')
+    def export_users_command(output, compress, after, batch_size):
+        """Stream all users as NDJSON (without passwords) to OUTPUT or stdout"""
+        from Modules.Core import Database
+        from .Services.UserExporter import UserExporter
+        
+        exporter = UserExporter()
+        error, after, batch_size = exporter.validate_options(after, batch_size)
+        if error:
+            raise click.BadParameter(error)
+        Database.ensure_connected()
+        if output == '-':
+            exporter.export(click.get_binary_stream('stdout'), after, batch_size, compress)
+            return
+        with open(output, 'ab' if after is not None else 'wb') as target:
+            written = exporter.export(target, after, batch_size, compress)
+        click.echo(f"Wrote {written} bytes to {output}", err=True)
+
+    @app.cli.command('backfill-email-keys')
+    @click.option('--batch-size', type=int, help='Users updated per batch')
+    @click.option('--pause-ms', type=float, default=0, help='Pause between batches to leave room for live traffic')
+    def backfill_email_keys_command(batch_size, pause_ms):
+        """Fill the canonical email_key on users created before it existed"""
+        from Modules.Core import Database
+        from .Services.EmailKeyBackfill import EmailKeyBackfill
+        
+        Database.ensure_connected()
+        stats = EmailKeyBackfill(batch_size=batch_size, pause=pause_ms / 1000).run()
+        click.echo(json.dumps(stats))
+        if stats['conflicts']:
+            click.echo(f"{len(stats['conflicts'])} users share an email differing only by case and were skipped", err=True)
@@ -0,0 +1,27 @@
+from abc import ABC, abstractmethod
+
+
+
+class AsyncUserContract(ABC):
+    @abstractmethod
+    async def find_by_id(self, user_id: str):
+        pass
+
+    @abstractmethod
+    async def find_many(self, user_ids):
+        pass
+
+    @abstractmethod
+    async def list_users(self, cursor=None, limit=None, name=None, email=None):
+        pass
+
+    @abstractmethod
+    async def create(self, data):
+        pass
+
+    @abstractmethod
+    async def bulk_create(self, users):
+        pass
+
+
+
@@ -7,9 +7,21 @@ class UserContract(ABC):
     def find_by_id(self, user_id: str):
         pass
 
+    @abstractmethod
+    def find_many(self, user_ids):
+        pass
+
+    @abstractmethod
+    def list_users(self, cursor=None, limit=None, name=None, email=None):
+        pass
+
     @abstractmethod
     def create(self, data):
         pass
 
+    @abstractmethod
+    def bulk_create(self, users):
+        pass
+
 
 
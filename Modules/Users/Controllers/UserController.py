@@ -1,9 +1,9 @@
-from flask import Blueprint, jsonify, request
+from flask import Blueprint, Response, jsonify, request, stream_with_context
 from flask_restx import Namespace, Resource, fields
-from flask_jwt_extended import jwt_required, get_jwt_identity
-from ..Services.UserService import UserService
+from Modules.Core.VerifiedTokenCache import cached_jwt_required
 
 user_blueprint = Blueprint('user', __name__)
+# Services are imported inside the handlers so Mongo and bcrypt stay out of cold start
 user_ns = Namespace('users', description='User operations')
 
 #  models for swagger documentation
@@ -23,23 +23,125 @@ user_response_model = user_ns.model('UserResponse', {
     'user': fields.Nested(user_model)
 })
 
+bulk_result_model = user_ns.model('BulkUserResult', {
+    'index': fields.Integer(description='Position of the item in the request'),
+    'status': fields.Integer(description='Per-item status code'),
+    'user': fields.Nested(user_model, allow_null=True),
+    'error': fields.String(description='Error message for failed items')
+})
+
+bulk_response_model = user_ns.model('BulkUserResponse', {
+    'created': fields.Integer(description='Number of users created'),
+    'failed': fields.Integer(description='Number of users rejected'),
+    'results': fields.List(fields.Nested(bulk_result_model))
+})
+
+lookup_input_model = user_ns.model('UserLookupInput', {
+    'ids': fields.List(fields.String, required=True, description='User ids to resolve')
+})
+
+lookup_result_model = user_ns.model('UserLookupResult', {
+    'id': fields.String(description='Requested user id'),
+    'status': fields.Integer(description='Per-item status code'),
+    'user': fields.Nested(user_model, allow_null=True),
+    'error': fields.String(description='Error message for invalid or missing ids')
+})
+
+lookup_response_model = user_ns.model('UserLookupResponse', {
+    'found': fields.Integer(description='Number of users found'),
+    'missing': fields.Integer(description='Number of ids invalid or not found'),
+    'results': fields.List(fields.Nested(lookup_result_model))
+})
+
+user_page_model = user_ns.model('UserPage', {
+    'users': fields.List(fields.Nested(user_model)),
+    'next_cursor': fields.String(description='Cursor for the next page, null on the last page')
+})
+
+list_parser = user_ns.parser()
+list_parser.add_argument('cursor', type=str, location='args', help='Cursor returned by the previous page')
+list_parser.add_argument('limit', type=int, location='args', help='Page size (capped server-side)')
+list_parser.add_argument('name', type=str, location='args', help='Name prefix filter')
+list_parser.add_argument('email', type=str, location='args', help='Email prefix filter')
+
+export_parser = user_ns.parser()
+export_parser.add_argument('after', type=str, location='args', help='Resume after this _id (the last one received)')
+export_parser.add_argument('batch_size', type=int, location='args', help='Documents per cursor batch')
+
 error_model = user_ns.model('ErrorResponse', {
     'error': fields.String(description='Error message')
 })
 
 
+@user_ns.route('')
+class UserCollectionResource(Resource):
+    @user_ns.doc('list_users', security='Bearer Auth')
+    @user_ns.expect(list_parser)
+    @user_ns.response(200, 'Success', user_page_model)
+    @user_ns.response(400, 'Validation error', error_model)
+    @user_ns.response(401, 'Unauthorized', error_model)
+    @cached_jwt_required()
+    def get(self):
+        """List users with keyset pagination (requires authentication)"""
+        args = list_parser.parse_args()
+        from ..Services.UserService import UserService
+        user_service = UserService()
+        response, status_code = user_service.list_users(
+            cursor=args.get('cursor'),
+            limit=args.get('limit'),
+            name=args.get('name'),
+            email=args.get('email')
+        )
+        return response, status_code
+
+@user_ns.route('/export')
+class UserExportResource(Resource):
+    @user_ns.doc('export_users', security='Bearer Auth')
+    @user_ns.expect(export_parser)
+    @user_ns.produces(['application/x-ndjson'])
+    @user_ns.response(200, 'NDJSON stream, gzip-encoded when the client accepts it')
+    @user_ns.response(400, 'Validation error', error_model)
+    @user_ns.response(401, 'Unauthorized', error_model)
+    @cached_jwt_required()
+    def get(self):
+        """Stream every user as NDJSON, in _id order (requires authentication)"""
+        args = export_parser.parse_args()
+        from ..Services.UserExporter import UserExporter
+        exporter = UserExporter()
+        error, after, batch_size = exporter.validate_options(args.get('after'), args.get('batch_size'))
+        if error:
+            return {"error": error}, 400
+        
+        compress = request.accept_encodings['gzip'] > 0
+        headers = {'Vary': 'Accept-Encoding'}
+        if compress:
+            headers['Content-Encoding'] = 'gzip'
+        return Response(
+            stream_with_context(exporter.iter_chunks(after, batch_size, compress)),
+            mimetype='application/x-ndjson',
+            headers=headers
+        )
+
 @user_ns.route('/<string:user_id>')
 class UserResource(Resource):
     @user_ns.doc('get_user', security='Bearer Auth')
     @user_ns.response(200, 'Success', user_response_model)
+    @user_ns.response(304, 'Not modified since the ETag sent in If-None-Match')
     @user_ns.response(404, 'User not found', error_model)
     @user_ns.response(401, 'Unauthorized', error_model)
-    @jwt_required()
+    @cached_jwt_required()
     def get(self, user_id):
-        """Get user by ID (requires authentication)"""
+        """Get user by ID (requires authentication, supports If-None-Match)"""
+        from ..Services.UserService import UserService
         user_service = UserService()
         response, status_code = user_service.find_by_id(user_id)
-        return response, status_code
+        if status_code != 200:
+            return response, status_code
+        
+        etag = user_service.user_etag(response['user'])
+        if request.if_none_match.contains_weak(etag):
+            return Response(status=304, headers={'ETag': f'"{etag}"'})
+        return response, status_code, {'ETag': f'"{etag}"'}
 
 @user_ns.route('/create')
 class UserListResource(Resource):
@@ -48,13 +150,44 @@ class UserListResource(Resource):
     @user_ns.response(201, 'User created', user_response_model)
     @user_ns.response(400, 'Validation error', error_model)
     @user_ns.response(401, 'Unauthorized', error_model)
-    @jwt_required()
+    @cached_jwt_required()
     def post(self):
         """Create a new user (requires authentication)"""
         data = request.get_json()
+        from ..Services.UserService import UserService
         user_service = UserService()
         response, status_code = user_service.create(data)
         return response, status_code
 
+@user_ns.route('/bulk')
+class UserBulkResource(Resource):
+    @user_ns.doc('bulk_create_users', security='Bearer Auth')
+    @user_ns.expect([user_input_model])
+    @user_ns.response(201, 'All users created', bulk_response_model)
+    @user_ns.response(207, 'Some users rejected', bulk_response_model)
+    @user_ns.response(400, 'Validation error', error_model)
+    @user_ns.response(401, 'Unauthorized', error_model)
+    @cached_jwt_required()
+    def post(self):
+        """Create many users in one request (requires authentication)"""
+        data = request.get_json()
+        from ..Services.UserService import UserService
+        user_service = UserService()
+        response, status_code = user_service.bulk_create(data)
+        return response, status_code
 
-    
\ No newline at end of file
+@user_ns.route('/lookup')
+class UserLookupResource(Resource):
+    @user_ns.doc('lookup_users', security='Bearer Auth')
+    @user_ns.expect(lookup_input_model)
+    @user_ns.response(200, 'Success', lookup_response_model)
+    @user_ns.response(400, 'Validation error', error_model)
+    @user_ns.response(401, 'Unauthorized', error_model)
+    @cached_jwt_required()
+    def post(self):
+        """Resolve many users by id in one request (requires authentication)"""
+        data = request.get_json(silent=True)
+        from ..Services.UserService import UserService
+        user_service = UserService()
+        response, status_code = user_service.find_many(data.get('ids') if isinstance(data, dict) else None)
+        return response, status_code
@@ -0,0 +1,7 @@
+def email_key_for(email):
+    """
+    Canonical form of an address, stored in User.email_key under a unique index.
+    Kept out of the model module so cold-start code (the email filter) can use it
+    without importing MongoEngine.
+    """
+    return email.strip().lower()
@@ -0,0 +1,32 @@
+from ..User import User
+from .UserExporter import EXPORT_BATCH_SIZE, ExportChunker, UserExporter
+from Modules.Core.AsyncDatabase import get_async_collection
+
+class AsyncUserExporter(UserExporter):
+    """Async counterpart of UserExporter reading through the non-blocking Mongo driver"""
+
+    @property
+    def collection(self):
+        if self._collection is None:
+            self._collection = get_async_collection(User._meta['collection'])
+        return self._collection
+
+    async def iter_lines(self, after=None, batch_size=EXPORT_BATCH_SIZE):
+        query = {'_id': {'$gt': after}} if after is not None else {}
+        cursor = self.collection.find(query, User.public_projection(), batch_size=batch_size).sort('_id', 1)
+        try:
+            async for raw in cursor:
+                yield self.serializer.dumps(User.to_public_dict(raw)) + b'\n'
+        finally:
+            await cursor.close()
+
+    async def iter_chunks(self, after=None, batch_size=EXPORT_BATCH_SIZE, compress=False):
+        """Yield NDJSON (optionally gzip) in chunks of about EXPORT_CHUNK_BYTES"""
+        chunker = ExportChunker(compress)
+        async for line in self.iter_lines(after, batch_size):
+            chunk = chunker.add(line)
+            if chunk:
+                yield chunk
+        chunk = chunker.finish()
+        if chunk:
+            yield chunk
@@ -0,0 +1,140 @@
+from bson import ObjectId
+from bson.errors import InvalidId
+from ..Contracts.AsyncUserContract import AsyncUserContract
+from ..User import User
+from .UserValidation import UserValidation
+from .UserService import user_cache
+from .EmailFilter import email_filter
+from Modules.Core.AsyncDatabase import get_async_collection
+from Modules.Core.PasswordHasher import password_hasher, HashingQueueFull
+from pymongo.errors import BulkWriteError, DuplicateKeyError
+import asyncio
+
+class AsyncUserService(UserValidation, AsyncUserContract):
+    """Async counterpart of UserService backed by the non-blocking Mongo driver"""
+
+    def __init__(self, collection=None, cache=None, hasher=None, emails=None):
+        self._collection = collection
+        self.cache = cache if cache is not None else user_cache
+        self.hasher = hasher if hasher is not None else password_hasher
+        self.emails = emails if emails is not None else email_filter
+
+    @property
+    def collection(self):
+        if self._collection is None:
+            self._collection = get_async_collection(User._meta['collection'])
+        return self._collection
+
+    async def find_by_id(self, user_id):
+        cached = self.cache.get(user_id)
+        if cached is not None:
+            return {"user": dict(cached)}, 200
+        try:
+            object_id = ObjectId(user_id)
+        except (InvalidId, TypeError):
+            return {"error": "User not found"}, 404
+        
+        raw = await self.collection.find_one({'_id': object_id}, User.public_projection())
+        if raw is None:
+            return {"error": "User not found"}, 404
+        
+        user_dict = User.to_public_dict(raw)
+        # Keyed like the sync service and create(): one entry per user, whatever form the id came in
+        self.cache.set(user_dict['_id'], user_dict)
+        return {"user": dict(user_dict)}, 200
+
+    async def find_many(self, user_ids):
+        error, results, pending = self.validate_lookup(user_ids)
+        if error:
+            return {"error": error}, 400
+        try:
+            raw_users = []
+            if pending:
+                raw_users = await (
+                    self.collection
+                    .find({'_id': {'$in': list(pending)}}, User.public_projection())
+                    .to_list(length=len(pending))
+                )
+            self.record_lookup(results, user_ids, pending, raw_users)
+            return self.lookup_response(results), 200
+        except Exception as e:
+            return {"error": str(e)}, 500
+
+    async def list_users(self, cursor=None, limit=None, name=None, email=None):
+        error, query, sort, limit = self.build_page_query(cursor, limit, name, email)
+        if error:
+            return {"error": error}, 400
+        try:
+            raw_users = await (
+                self.collection
+                .find(query, User.public_projection())
+                .sort(sort)
+                .limit(limit + 1)
+                .to_list(length=limit + 1)
+            )
+            return self.page_response(raw_users, limit, sort), 200
+        except Exception as e:
+            return {"error": str(e)}, 500
+
+    async def create(self, data):
+        try:
+            error = self.validate_user_data(data)
+            if error:
+                return {"error": error}, 400
+            
+            if await self.email_taken(data.get('email')):
+                return {"error": "A user with this email already exists"}, 400
+            
+            password_hash = await self.hasher.hash_async(data.get('password'))
+            document = User(
+                name=self.normalize_name(data.get('name')),
+                email=data.get('email'),
+                email_key=User.email_key_for(data.get('email')),
+                password=password_hash
+            ).to_mongo().to_dict()
+            document['_id'] = ObjectId()
+            await self.collection.insert_one(document)
+            
+            user_dict = User.to_public_dict(document)
+            self.cache.set(user_dict['_id'], user_dict)
+            self.emails.add(document['email'])
+            return {"user": dict(user_dict)}, 201
+        except DuplicateKeyError:
+            return {"error": "A user with this email already exists"}, 400
+        except HashingQueueFull:
+            return {"error": "Server busy, retry later"}, 503
+        except Exception as e:
+            return {"error": str(e)}, 500
+
+    async def email_taken(self, email):
+        if not self.emails.might_exist(email):
+            return False
+        return await self.collection.find_one(self.duplicate_email_query(email), {'_id': 1}) is not None
+
+    async def bulk_create(self, users):
+        error, results, valid = self.validate_bulk(users)
+        if error:
+            return {"error": error}, 400
+        
+        try:
+            # hash_many applies backpressure by blocking, so keep it off the event loop
+            passwords = [users[index]['password'] for index in valid]
+            password_hashes = await asyncio.get_running_loop().run_in_executor(None, self.hasher.hash_many, passwords)
+            documents = self.build_bulk_documents(users, valid, password_hashes)
+            
+            chunks = list(self.bulk_chunks(documents))
+            for position, chunk in enumerate(chunks):
+                failed = {}
+                try:
+                    await self.collection.insert_many([document for _, document in chunk], ordered=False)
+                except BulkWriteError as e:
+                    failed = self.bulk_write_failures(e.details)
+                except Exception as e:
+                    # Chunks already written keep their results; only the rest fail
+                    self.record_bulk_abort(results, chunks[position:], str(e))
+                    break
+                self.record_bulk_chunk(results, chunk, failed)
+            
+            return self.bulk_response(results)
+        except Exception as e:
+            return {"error": str(e)}, 500
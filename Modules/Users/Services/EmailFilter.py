@@ -0,0 +1,108 @@
+from threading import Lock, Thread
+from Modules.Core.BloomFilter import BloomFilter
+from Modules.Core.Metrics import registry
+from ..EmailKey import email_key_for
+import logging
+import os
+import time
+
+logger = logging.getLogger(__name__)
+
+LOAD_BATCH_SIZE = 5000
+LOAD_RETRY_SECONDS = 30
+
+email_filter_checks = registry.counter(
+    'omninext_email_filter_checks_total', 'Registered-email filter answers on create', ('result',))
+
+def email_filter_enabled():
+    return os.getenv('EMAIL_FILTER', 'on').lower() in ('on', '1', 'true', 'yes')
+
+class EmailFilter:
+    """
+    In-memory membership filter of registered emails, used to skip the
+    existence query (and the bcrypt hash) for emails that are certainly new.
+    Until it is loaded it answers "maybe" for everything, so callers always
+    fall back to the indexed query; the unique index stays the final check,
+    which also covers users created by other processes after the load.
+    """
+
+    def __init__(self, capacity=1000000, error_rate=0.01):
+        self.bloom = BloomFilter(capacity, error_rate)
+        self.ready = False
+        self._loading = False
+        self._retry_at = 0.0
+        self._lock = Lock()
+
+    # Same canonical form as the unique email_key index
+    key = staticmethod(email_key_for)
+
+    def add(self, email):
+        if email:
+            self.bloom.add(self.key(email))
+
+    def might_exist(self, email):
+        if not self.ready:
+            email_filter_checks.inc('not_ready')
+            return True
+        if self.key(email) in self.bloom:
+            email_filter_checks.inc('maybe')
+            return True
+        email_filter_checks.inc('absent')
+        return False
+
+    def load(self, emails):
+        """Add every email of an iterable, then start answering "absent" """
+        for email in emails:
+            self.add(email)
+        self.ready = True
+
+    def load_from_collection(self):
+        """Stream the email of every user (projection only, large batches) into the filter"""
+        # Once per process, on the loader thread: the model stays out of cold start, as in Database.warmup
+        from Modules.Users.User import User
+        started_at = time.perf_counter()
+        cursor = User._get_collection().find({}, {'email': 1, '_id': 0}, batch_size=LOAD_BATCH_SIZE)
+        self.load(raw.get('email') for raw in cursor)
+        logger.info("Email filter loaded with %d emails in %.0fms",
+                    self.bloom.count, (time.perf_counter() - started_at) * 1000)
+
+    def start_loading(self):
+        """Load in a background thread once per process; requests never wait for it"""
+        if self.ready or self._loading or time.monotonic() < self._retry_at:
+            return
+        with self._lock:
+            if self.ready or self._loading:
+                return
+            self._loading = True
+        Thread(target=self._load_in_background, name='email-filter-loader', daemon=True).start()
+
+    def _load_in_background(self):
+        try:
+            self.load_from_collection()
+        except Exception:
+            logger.exception("Email filter load failed, retrying in %ss", LOAD_RETRY_SECONDS)
+            self._retry_at = time.monotonic() + LOAD_RETRY_SECONDS
+        finally:
+            self._loading = False
+
+    def reset_after_fork(self):
+        # A loader thread started in the parent does not exist in the child
+        self._lock = Lock()
+        if not self.ready:
+            self._loading = False
+
+    def stats(self):
+        return dict(self.bloom.stats(), ready=self.ready)
+
+email_filter = EmailFilter(
+    capacity=int(os.getenv('EMAIL_FILTER_CAPACITY', 1000000)),
+    error_rate=float(os.getenv('EMAIL_FILTER_ERROR_RATE', 0.01))
+)
+
+def init_app(app):
+    """Build the filter from the users collection when this process serves its first request"""
+    if app.config.get('EMAIL_FILTER', email_filter_enabled()):
+        app.before_request(email_filter.start_loading)
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=email_filter.reset_after_fork)
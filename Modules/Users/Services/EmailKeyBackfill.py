@@ -0,0 +1,72 @@
+from ..User import User
+from .UserValidation import DUPLICATE_KEY_ERROR
+from pymongo import UpdateOne
+from pymongo.errors import BulkWriteError
+import logging
+import os
+import time
+
+logger = logging.getLogger(__name__)
+
+BACKFILL_BATCH_SIZE = int(os.getenv('EMAIL_KEY_BACKFILL_BATCH_SIZE', 500))
+
+class EmailKeyBackfill:
+    """
+    Online migration filling `email_key` on users created before it existed.
+    Walks the collection in _id order with small batches of conditional,
+    unordered updates and an optional pause between batches, so live traffic
+    keeps its share of the server. Documents whose canonical key is already
+    taken (accounts differing only by case) are left untouched and reported.
+    """
+
+    def __init__(self, collection=None, batch_size=None, pause=0.0, sleep=time.sleep):
+        self._collection = collection
+        self.batch_size = batch_size or BACKFILL_BATCH_SIZE
+        self.pause = pause
+        self.sleep = sleep
+
+    @property
+    def collection(self):
+        if self._collection is None:
+            self._collection = User._get_collection()
+        return self._collection
+
+    def run(self):
+        stats = {"scanned": 0, "updated": 0, "conflicts": []}
+        last_id = None
+        while True:
+            query = {'email_key': {'$exists': False}}
+            if last_id is not None:
+                query['_id'] = {'$gt': last_id}
+            batch = list(
+                self.collection.find(query, {'email': 1}).sort('_id', 1).limit(self.batch_size)
+            )
+            if not batch:
+                return stats
+            last_id = batch[-1]['_id']
+            stats["scanned"] += len(batch)
+            self.update_batch(batch, stats)
+            if self.pause:
+                self.sleep(self.pause)
+
+    def update_batch(self, batch, stats):
+        # The $exists guard keeps concurrent creates and reruns from being overwritten
+        requests = [
+            UpdateOne(
+                {'_id': raw['_id'], 'email_key': {'$exists': False}},
+                {'$set': {'email_key': User.email_key_for(raw['email'])}}
+            )
+            for raw in batch
+        ]
+        try:
+            result = self.collection.bulk_write(requests, ordered=False)
+            stats["updated"] += result.modified_count
+        except BulkWriteError as e:
+            stats["updated"] += e.details.get('nModified', 0)
+            write_errors = e.details.get('writeErrors', [])
+            if any(write_error.get('code') != DUPLICATE_KEY_ERROR for write_error in write_errors):
+                raise
+            for write_error in write_errors:
+                raw = batch[write_error['index']]
+                logger.warning("email_key conflict for user %s: %s", raw['_id'], write_error.get('errmsg'))
+                stats["conflicts"].append(str(raw['_id']))
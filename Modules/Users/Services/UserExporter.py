@@ -0,0 +1,99 @@
+from bson import ObjectId
+from bson.errors import InvalidId
+from ..User import User
+from Modules.Core.JsonSerializer import build_serializer
+import os
+import zlib
+
+EXPORT_BATCH_SIZE = int(os.getenv('USER_EXPORT_BATCH_SIZE', 1000))
+EXPORT_BATCH_SIZE_MAX = 10000
+# Lines are grouped into chunks of about this size before being written or sent
+EXPORT_CHUNK_BYTES = 64 * 1024
+
+class ExportChunker:
+    """Group NDJSON lines into chunks of about EXPORT_CHUNK_BYTES, gzip-compressed on request"""
+
+    def __init__(self, compress=False):
+        self.compressor = zlib.compressobj(wbits=31) if compress else None
+        self.buffer = []
+        self.size = 0
+
+    def add(self, line):
+        """Buffer a line; return the next chunk once enough bytes are buffered, else b''"""
+        self.buffer.append(line)
+        self.size += len(line)
+        if self.size < EXPORT_CHUNK_BYTES:
+            return b''
+        chunk = b''.join(self.buffer)
+        self.buffer, self.size = [], 0
+        return self.compressor.compress(chunk) if self.compressor else chunk
+
+    def finish(self):
+        chunk = b''.join(self.buffer)
+        self.buffer, self.size = [], 0
+        if self.compressor:
+            chunk = self.compressor.compress(chunk) + self.compressor.flush()
+        return chunk
+
+class UserExporter:
+    """
+    Stream the users collection as NDJSON, one public user dict per line.
+    Documents come from a single server-side cursor in _id order with the
+    public projection (never the password), so memory stays flat whatever the
+    collection size and an interrupted export resumes after the last _id seen.
+    """
+
+    def __init__(self, collection=None, serializer=None):
+        self._collection = collection
+        self.serializer = serializer if serializer is not None else build_serializer()
+
+    @property
+    def collection(self):
+        if self._collection is None:
+            self._collection = User._get_collection()
+        return self._collection
+
+    def validate_options(self, after=None, batch_size=None):
+        """Return (error, after ObjectId or None, batch size)"""
+        try:
+            batch_size = EXPORT_BATCH_SIZE if batch_size is None else int(batch_size)
+        except (TypeError, ValueError):
+            return "Batch size must be an integer", None, None
+        if batch_size < 1:
+            return "Batch size must be positive", None, None
+        batch_size = min(batch_size, EXPORT_BATCH_SIZE_MAX)
+        if not after:
+            return None, None, batch_size
+        try:
+            return None, ObjectId(after), batch_size
+        except (InvalidId, TypeError):
+            return "Invalid resume id", None, None
+
+    def iter_lines(self, after=None, batch_size=EXPORT_BATCH_SIZE):
+        query = {'_id': {'$gt': after}} if after is not None else {}
+        cursor = self.collection.find(query, User.public_projection(), batch_size=batch_size).sort('_id', 1)
+        try:
+            for raw in cursor:
+                yield self.serializer.dumps(User.to_public_dict(raw)) + b'\n'
+        finally:
+            cursor.close()
+
+    def iter_chunks(self, after=None, batch_size=EXPORT_BATCH_SIZE, compress=False):
+        """Yield NDJSON (optionally gzip) in chunks of about EXPORT_CHUNK_BYTES"""
+        chunker = ExportChunker(compress)
+        for line in self.iter_lines(after, batch_size):
+            chunk = chunker.add(line)
+            if chunk:
+                yield chunk
+        chunk = chunker.finish()
+        if chunk:
+            yield chunk
+
+    def export(self, output, after=None, batch_size=EXPORT_BATCH_SIZE, compress=False):
+        """Write the export to a binary file object and return the number of bytes written"""
+        written = 0
+        for chunk in self.iter_chunks(after, batch_size, compress):
+            output.write(chunk)
+            written += len(chunk)
+        output.flush()
+        return written
@@ -0,0 +1,160 @@
+from bson import ObjectId
+from ..User import User
+from .UserValidation import UserValidation
+from Modules.Core.PasswordHasher import PasswordHasher
+from pymongo.errors import BulkWriteError
+import csv
+import json
+import os
+
+IMPORT_BATCH_SIZE = int(os.getenv('USER_IMPORT_BATCH_SIZE', 1000))
+
+class UserImporter(UserValidation):
+    """
+    Stream users from a CSV or NDJSON file into the users collection.
+    Rows are read one at a time and written in unordered insert_many batches,
+    so memory stays flat whatever the file size. After every batch the
+    number of consumed rows is checkpointed; a rerun with the same checkpoint
+    skips them. The _ids of a batch are checkpointed before it is written, so
+    a batch interrupted midway is replayed with the same _ids and the rows it
+    already wrote count as created, not as duplicates. Rejected rows are
+    appended to a NDJSON side file, without their password.
+    """
+
+    def __init__(self, collection=None, hasher=None, batch_size=None, checkpoint_path=None, rejects_path=None):
+        self._collection = collection
+        self.hasher = hasher if hasher is not None else PasswordHasher(max_workers=os.cpu_count() or 1)
+        self.batch_size = batch_size or IMPORT_BATCH_SIZE
+        self.checkpoint_path = checkpoint_path
+        self.rejects_path = rejects_path
+
+    @property
+    def collection(self):
+        if self._collection is None:
+            self._collection = User._get_collection()
+        return self._collection
+
+    @staticmethod
+    def detect_format(path):
+        return 'csv' if path.lower().endswith('.csv') else 'ndjson'
+
+    def read_rows(self, path, file_format=None):
+        """Yield (line number, row) pairs; rows that can't be parsed are yielded as None"""
+        file_format = file_format or self.detect_format(path)
+        with open(path, newline='', encoding='utf-8') as source:
+            if file_format == 'csv':
+                reader = csv.DictReader(source)
+                for row in reader:
+                    yield reader.line_num, row
+                return
+            for line_number, line in enumerate(source, start=1):
+                if not line.strip():
+                    continue
+                try:
+                    yield line_number, json.loads(line)
+                except ValueError:
+                    yield line_number, None
+
+    def load_checkpoint(self):
+        if not self.checkpoint_path or not os.path.exists(self.checkpoint_path):
+            return {"rows": 0, "created": 0, "rejected": 0}
+        with open(self.checkpoint_path, encoding='utf-8') as checkpoint:
+            return json.load(checkpoint)
+
+    def save_checkpoint(self, progress):
+        if not self.checkpoint_path:
+            return
+        # Write-then-rename so an interruption never leaves a torn checkpoint
+        temporary_path = self.checkpoint_path + '.tmp'
+        with open(temporary_path, 'w', encoding='utf-8') as checkpoint:
+            json.dump(progress, checkpoint)
+        os.replace(temporary_path, self.checkpoint_path)
+
+    def run(self, path, file_format=None):
+        """Import a file and return the totals (including rows imported by earlier runs)"""
+        progress = self.load_checkpoint()
+        skip = progress['rows']
+        rejects = open(self.rejects_path, 'a', encoding='utf-8') if self.rejects_path else None
+        try:
+            batch = []
+            for position, (line_number, row) in enumerate(self.read_rows(path, file_format)):
+                if position < skip:
+                    continue
+                batch.append((line_number, row))
+                if len(batch) >= self.batch_size:
+                    self.import_batch(batch, progress, rejects)
+                    batch = []
+            if batch:
+                self.import_batch(batch, progress, rejects)
+        finally:
+            if rejects:
+                rejects.close()
+        return progress
+
+    def import_batch(self, batch, progress, rejects):
+        """Validate, hash and insert one batch, then record it in the checkpoint"""
+        rows = [row for _, row in batch]
+        start = progress['rows']
+        # Row position -> _id of rows an interrupted run may already have written
+        replayed = progress.get('pending', {})
+        failed = {}
+        valid = []
+        for index, row in enumerate(rows):
+            error = self.validate_user_data(row) if row is not None else "Malformed row"
+            if error:
+                failed[index] = error
+            else:
+                valid.append(index)
+
+        write_failures = 0
+        if valid:
+            # bcrypt releases the GIL, so a pool sized on the cores hashes in parallel
+            password_hashes = self.hasher.hash_many([rows[index]['password'] for index in valid])
+            documents = self.build_bulk_documents(rows, valid, password_hashes)
+            for index, document in documents:
+                if str(start + index) in replayed:
+                    document['_id'] = ObjectId(replayed[str(start + index)])
+            progress['pending'] = dict(
+                {position: object_id for position, object_id in replayed.items() if int(position) >= start + len(batch)},
+                **{str(start + index): str(document['_id']) for index, document in documents}
+            )
+            self.save_checkpoint(progress)
+            try:
+                self.collection.insert_many([document for _, document in documents], ordered=False)
+            except BulkWriteError as e:
+                failures = self.bulk_write_failures(e.details)
+                written = self.written_before(documents, failures, start, replayed)
+                for position, error in failures.items():
+                    if documents[position][1]['_id'] in written:
+                        continue
+                    failed[documents[position][0]] = error
+                    write_failures += 1
+
+        for index in sorted(failed):
+            self.write_reject(rejects, batch[index][0], rows[index], failed[index])
+        if rejects is not None:
+            rejects.flush()
+        progress['rows'] += len(batch)
+        progress['created'] += len(valid) - write_failures
+        progress['rejected'] += len(failed)
+        pending = {position: object_id for position, object_id in progress.pop('pending', replayed).items()
+                   if int(position) >= progress['rows']}
+        if pending:
+            progress['pending'] = pending
+        self.save_checkpoint(progress)
+
+    def written_before(self, documents, failures, start, replayed):
+        """_ids of failed replayed documents that the interrupted run had already inserted"""
+        candidates = [documents[position][1]['_id'] for position in failures
+                      if str(start + documents[position][0]) in replayed]
+        if not candidates:
+            return set()
+        return {raw['_id'] for raw in self.collection.find({'_id': {'$in': candidates}}, {'_id': 1})}
+
+    def write_reject(self, rejects, line_number, row, error):
+        if rejects is None:
+            return
+        if isinstance(row, dict):
+            # Never copy plain-text passwords into the side file
+            row = {key: value for key, value in row.items() if key != 'password'}
+        rejects.write(json.dumps({"line": line_number, "error": error, "row": row}) + '\n')
@@ -1,70 +1,194 @@
 from flask import jsonify
 from bson import ObjectId
+from bson.errors import InvalidId
 from ..Contracts.UserContract import UserContract
 from ..User import User
-from mongoengine.errors import DoesNotExist, ValidationError, NotUniqueError
-import re
-import bcrypt
+from .UserValidation import UserValidation
+from .EmailFilter import email_filter
+from Modules.Core.LRUCache import LRUCache
+from Modules.Core.Metrics import registry, stage, timed_service
+from Modules.Core.SingleFlight import SingleFlight, SingleFlightTimeout
+from Modules.Core.PasswordHasher import password_hasher, HashingQueueFull
+from mongoengine.errors import NotUniqueError
+from pymongo.errors import BulkWriteError
+import os
 
-class UserService(UserContract):
+# Shared read-through cache of serialized, password-free user dicts keyed by id
+user_cache = LRUCache(
+    max_size=int(os.getenv('USER_CACHE_SIZE', 1024)),
+    ttl=float(os.getenv('USER_CACHE_TTL', 60))
+)
+
+# Concurrent cache misses for the same id share one Mongo query
+user_flight = SingleFlight(timeout=float(os.getenv('USER_FLIGHT_TIMEOUT', 5)), name='user_lookup')
+registry.register_collector(user_flight.collect)
+
+class UserService(UserValidation, UserContract):
+
+    def __init__(self, cache=None, hasher=None, flight=None, emails=None):
+        self.cache = cache if cache is not None else user_cache
+        self.hasher = hasher if hasher is not None else password_hasher
+        self.flight = flight if flight is not None else user_flight
+        self.emails = emails if emails is not None else email_filter
     
+    @timed_service
     def find_by_id(self, user_id):
+        cached = self.cache.get(user_id)
+        if cached is not None:
+            return {"user": dict(cached)}, 200
         try:
-            user = User.objects.get(id=ObjectId(user_id))
-            user_dict = user.to_mongo().to_dict()
-            user_dict['_id'] = str(user_dict['_id'])
-            # Rimuovi la password dalla risposta
-            if 'password' in user_dict:
-                del user_dict['password']
-            return {"user": user_dict}, 200
-        except (DoesNotExist, ValidationError):
+            object_id = ObjectId(user_id)
+        except (InvalidId, TypeError):
             return {"error": "User not found"}, 404
+        
+        try:
+            user_dict = self.flight.do(str(object_id), self._load_public_user, object_id)
+        except SingleFlightTimeout:
+            return {"error": "Server busy, retry later"}, 503
+        if user_dict is None:
+            return {"error": "User not found"}, 404
+        return {"user": dict(user_dict)}, 200
+
+    def _load_public_user(self, object_id):
+        """Fetch one public user dict and fill the cache; shared by all coalesced callers"""
+        # Lean read: project only public fields and skip Document hydration
+        with stage('database'):
+            raw = User._get_collection().find_one({'_id': object_id}, User.public_projection())
+        if raw is None:
+            return None
+        
+        user_dict = User.to_public_dict(raw)
+        self.cache.set(user_dict['_id'], user_dict)
+        return user_dict
 
-    def validate_email(self, email):
-        pattern = r"^(?:[a-z0-9!#$%&'*+/=?^_`{|}~-]+(?:\.[a-z0-9!#$%&'*+/=?^_`{|}~-]+)*|\"(?:[\x01-\x08\x0b\x0c\x0e-\x1f\x21\x23-\x5b\x5d-\x7f]|\\[\x01-\x09\x0b\x0c\x0e-\x7f])*\")@(?:(?:[a-z0-9](?:[a-z0-9-]*[a-z0-9])?\.)+[a-z0-9](?:[a-z0-9-]*[a-z0-9])?|\[(?:(?:25[0-5]|2[0-4][0-9]|[01]?[0-9][0-9]?)\.){3}(?:25[0-5]|2[0-4][0-9]|[01]?[0-9][0-9]?|[a-z0-9-]*[a-z0-9]:(?:[\x01-\x08\x0b\x0c\x0e-\x1f\x21-\x5a\x53-\x7f]|\\[\x01-\x09\x0b\x0c\x0e-\x7f])+)\])$"
-        return re.match(pattern, email, re.IGNORECASE) is not None
+    @timed_service
+    def find_many(self, user_ids):
+        """
+        Resolve many users with one $in query.
+        Cached users are served without touching Mongo; results keep the input
+        order and flag ids that are invalid or not found.
+        """
+        error, results, pending = self.validate_lookup(user_ids)
+        if error:
+            return {"error": error}, 400
+        try:
+            raw_users = []
+            if pending:
+                with stage('database'):
+                    raw_users = list(
+                        User._get_collection().find({'_id': {'$in': list(pending)}}, User.public_projection())
+                    )
+            self.record_lookup(results, user_ids, pending, raw_users)
+            return self.lookup_response(results), 200
+        except Exception as e:
+            return {"error": str(e)}, 500
+
+    @timed_service
+    def list_users(self, cursor=None, limit=None, name=None, email=None):
+        error, query, sort, limit = self.build_page_query(cursor, limit, name, email)
+        if error:
+            return {"error": error}, 400
+        try:
+            # Fetch one extra document to know whether another page exists
+            with stage('database'):
+                raw_users = list(
+                    User._get_collection()
+                    .find(query, User.public_projection())
+                    .sort(sort)
+                    .limit(limit + 1)
+                )
+            return self.page_response(raw_users, limit, sort), 200
+        except Exception as e:
+            return {"error": str(e)}, 500
 
+    @timed_service
     def create(self, data):
         try:
+            error = self.validate_user_data(data)
+            if error:
+                return {"error": error}, 400
+            
             # Extract data from request
             name = data.get('name')
             email = data.get('email')
             password = data.get('password')
             
-            # Validate required fields
-            if not name or not email:
-                return {"error": "Name and email are required"}, 400
-            
-            # Validate email format
-            if not self.validate_email(email):
-                return {"error": "Invalid email format"}, 400
-            
-            # Controlla se è presente la password
-            if not password:
-                return {"error": "Password is required"}, 400
+            # Reject known emails before paying for a bcrypt hash
+            if self.email_taken(email):
+                return {"error": "A user with this email already exists"}, 400
                 
-            # Hash the password with bcrypt
-            hashed_pw = bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt())
-            password_hash = hashed_pw.decode('utf-8')
+            # Hash the password with bcrypt on the dedicated hashing pool
+            password_hash = self.hasher.hash(password)
             
             # Format name properly
-            name = name.strip().title()
+            name = self.normalize_name(name)
             
             # Create new user with hashed password
             new_user = User(
                 name=name,
                 email=email,
+                email_key=User.email_key_for(email),
                 password=password_hash
             )
-            new_user.save()
+            with stage('database'):
+                new_user.save()
+            
+            # Build the response from the written values; never send the password back
+            user_dict = {"_id": str(new_user.id), "name": name, "email": email}
             
-            # Convert to dict, remove password and format _id to string
-            user_dict = new_user.to_mongo().to_dict()
-            user_dict['_id'] = str(user_dict['_id'])
-            del user_dict['password']  # Non inviare mai la password nelle risposte
+            # Fill the read cache so the next lookup never sees stale data
+            self.cache.set(user_dict['_id'], user_dict)
+            self.emails.add(email)
             
-            return {"user": user_dict}, 201
+            return {"user": dict(user_dict)}, 201
         except NotUniqueError:
             return {"error": "A user with this email already exists"}, 400
+        except HashingQueueFull:
+            return {"error": "Server busy, retry later"}, 503
+        except Exception as e:
+            return {"error": str(e)}, 500
+
+    def email_taken(self, email):
+        """
+        Cheap duplicate check: emails the filter has never seen are new; a
+        "maybe" is confirmed with an _id-only query on the unique email indexes
+        """
+        if not self.emails.might_exist(email):
+            return False
+        with stage('database'):
+            return User._get_collection().find_one(self.duplicate_email_query(email), {'_id': 1}) is not None
+
+    @timed_service
+    def bulk_create(self, users):
+        """
+        Create many users at once.
+        Every item is validated up front, passwords are hashed in parallel and
+        valid users are written with chunked, unordered insert_many calls.
+        Returns a per-item result so one bad record doesn't fail the batch.
+        """
+        error, results, valid = self.validate_bulk(users)
+        if error:
+            return {"error": error}, 400
+        
+        try:
+            password_hashes = self.hasher.hash_many([users[index]['password'] for index in valid])
+            documents = self.build_bulk_documents(users, valid, password_hashes)
+            
+            collection = User._get_collection()
+            chunks = list(self.bulk_chunks(documents))
+            for position, chunk in enumerate(chunks):
+                failed = {}
+                try:
+                    with stage('database'):
+                        collection.insert_many([document for _, document in chunk], ordered=False)
+                except BulkWriteError as e:
+                    failed = self.bulk_write_failures(e.details)
+                except Exception as e:
+                    # Chunks already written keep their results; only the rest fail
+                    self.record_bulk_abort(results, chunks[position:], str(e))
+                    break
+                self.record_bulk_chunk(results, chunk, failed)
+            
+            return self.bulk_response(results)
         except Exception as e:
             return {"error": str(e)}, 500
@@ -0,0 +1,257 @@
+from bson import ObjectId
+from bson.errors import InvalidId
+from ..User import User
+import base64
+import hashlib
+import json
+import os
+import re
+
+# Sized to hash within a request timeout on a small pool; bigger loads go through `flask import-users`
+BULK_MAX_USERS = int(os.getenv('USER_BULK_MAX', 100))
+BULK_CHUNK_SIZE = int(os.getenv('USER_BULK_CHUNK_SIZE', 1000))
+DUPLICATE_KEY_ERROR = 11000
+PAGE_SIZE_DEFAULT = int(os.getenv('USER_PAGE_SIZE', 50))
+PAGE_SIZE_MAX = int(os.getenv('USER_PAGE_SIZE_MAX', 200))
+LOOKUP_MAX_IDS = int(os.getenv('USER_LOOKUP_MAX', 500))
+
+class UserValidation:
+    """
+    Validation and serialization rules shared by the sync and async user services.
+    Expects the host class to provide `cache` and `emails` (EmailFilter) attributes.
+    """
+
+    def validate_email(self, email):
+        pattern = r"^(?:[a-z0-9!#$%&'*+/=?^_`{|}~-]+(?:\.[a-z0-9!#$%&'*+/=?^_`{|}~-]+)*|\"(?:[\x01-\x08\x0b\x0c\x0e-\x1f\x21\x23-\x5b\x5d-\x7f]|\\[\x01-\x09\x0b\x0c\x0e-\x7f])*\")@(?:(?:[a-z0-9](?:[a-z0-9-]*[a-z0-9])?\.)+[a-z0-9](?:[a-z0-9-]*[a-z0-9])?|\[(?:(?:25[0-5]|2[0-4][0-9]|[01]?[0-9][0-9]?)\.){3}(?:25[0-5]|2[0-4][0-9]|[01]?[0-9][0-9]?|[a-z0-9-]*[a-z0-9]:(?:[\x01-\x08\x0b\x0c\x0e-\x1f\x21-\x5a\x53-\x7f]|\\[\x01-\x09\x0b\x0c\x0e-\x7f])+)\])$"
+        if not isinstance(email, str):
+            return False
+        return re.match(pattern, email, re.IGNORECASE) is not None
+
+    def validate_user_data(self, data):
+        """Return an error message for invalid user input, or None if valid"""
+        if not isinstance(data, dict):
+            return "User data must be an object"
+        
+        # Validate required fields
+        if not data.get('name') or not data.get('email'):
+            return "Name and email are required"
+        
+        # Wrongly typed values must fail this item only, not the batch
+        if not isinstance(data.get('name'), str) or not isinstance(data.get('email'), str):
+            return "Name and email must be strings"
+        
+        # Validate email format
+        if not self.validate_email(data.get('email')):
+            return "Invalid email format"
+        
+        # Controlla se è presente la password
+        if not data.get('password'):
+            return "Password is required"
+        
+        if not isinstance(data.get('password'), str):
+            return "Password must be a string"
+        
+        return None
+
+    def duplicate_email_query(self, email):
+        """Match the canonical key, or the exact email on documents not yet backfilled"""
+        return {'$or': [{'email_key': User.email_key_for(email)}, {'email': email}]}
+
+    def normalize_name(self, name):
+        """Format name properly"""
+        return name.strip().title()
+
+    def user_etag(self, user_dict):
+        """
+        Strong ETag from the content of a public user dict (as cached), so a
+        conditional GET is answered without serializing the response
+        """
+        content = '\x1f'.join(str(user_dict.get(field)) for field in ('_id',) + User.public_fields)
+        return hashlib.blake2b(content.encode('utf-8'), digest_size=12).hexdigest()
+
+    def build_page_query(self, cursor=None, limit=None, name=None, email=None):
+        """
+        Build a keyset-paginated listing query.
+        Returns (error, query, sort, limit). Unfiltered pages are ordered by _id;
+        with a prefix filter they are ordered by (field, _id) so the matching
+        (field, _id) index both bounds the range and returns it already sorted.
+        Pages continue after `cursor`, so no skip/offset is ever used.
+        """
+        try:
+            limit = PAGE_SIZE_DEFAULT if limit is None else int(limit)
+        except (TypeError, ValueError):
+            return "Limit must be an integer", None, None, None
+        if limit < 1:
+            return "Limit must be positive", None, None, None
+        limit = min(limit, PAGE_SIZE_MAX)
+        
+        # Anchored, case-sensitive prefixes; the name index drives the scan when both are given
+        query = {}
+        if name:
+            query['name'] = {'$regex': '^' + re.escape(name)}
+        if email:
+            query['email'] = {'$regex': '^' + re.escape(email)}
+        field = 'name' if name else 'email' if email else None
+        sort = [(field, 1), ('_id', 1)] if field else [('_id', 1)]
+        
+        if cursor:
+            position = self.decode_cursor(cursor, field)
+            if position is None:
+                return "Invalid cursor", None, None, None
+            value, object_id = position
+            if field is None:
+                query['_id'] = {'$gt': object_id}
+            else:
+                query[field]['$gte'] = value
+                query['$or'] = [{field: {'$gt': value}}, {'_id': {'$gt': object_id}}]
+        return None, query, sort, limit
+
+    def encode_cursor(self, sort, raw):
+        """Plain _id for _id-ordered pages, opaque (field, value, _id) token otherwise"""
+        if len(sort) == 1:
+            return str(raw['_id'])
+        field = sort[0][0]
+        payload = json.dumps([field, raw.get(field), str(raw['_id'])]).encode('utf-8')
+        return base64.urlsafe_b64encode(payload).decode('ascii').rstrip('=')
+
+    def decode_cursor(self, cursor, field):
+        """Return (value, ObjectId) for a cursor matching the page ordering, or None"""
+        try:
+            if field is None:
+                return None, ObjectId(cursor)
+            payload = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4))
+            cursor_field, value, object_id = json.loads(payload)
+            if cursor_field != field or not isinstance(value, str):
+                return None
+            return value, ObjectId(object_id)
+        except (InvalidId, TypeError, ValueError):
+            return None
+
+    def page_response(self, raw_users, limit, sort):
+        """Serialize a page fetched with limit + 1 documents"""
+        has_more = len(raw_users) > limit
+        page = raw_users[:limit]
+        return {
+            "users": [User.to_public_dict(raw) for raw in page],
+            "next_cursor": self.encode_cursor(sort, page[-1]) if has_more else None
+        }
+
+    def validate_lookup(self, user_ids):
+        """
+        Validate a batch lookup and resolve what the read cache already holds.
+        Returns (error, results, pending); results is in input order with None
+        for every id still to be fetched, pending maps ObjectId -> input positions.
+        """
+        if not isinstance(user_ids, list) or not user_ids:
+            return "A non-empty list of user ids is required", None, None
+        if len(user_ids) > LOOKUP_MAX_IDS:
+            return f"At most {LOOKUP_MAX_IDS} users can be looked up per request", None, None
+        
+        results = [None] * len(user_ids)
+        pending = {}
+        for index, user_id in enumerate(user_ids):
+            cached = self.cache.get(user_id) if isinstance(user_id, str) else None
+            if cached is not None:
+                results[index] = {"id": user_id, "status": 200, "user": dict(cached)}
+                continue
+            try:
+                object_id = ObjectId(user_id)
+            except (InvalidId, TypeError):
+                results[index] = {"id": user_id, "status": 400, "error": "Invalid user id"}
+                continue
+            pending.setdefault(object_id, []).append(index)
+        return None, results, pending
+
+    def record_lookup(self, results, user_ids, pending, raw_users):
+        """Place fetched documents at their input positions and mark the rest as not found"""
+        for raw in raw_users:
+            user_dict = User.to_public_dict(raw)
+            self.cache.set(user_dict['_id'], user_dict)
+            for index in pending.pop(raw['_id'], ()):
+                results[index] = {"id": user_ids[index], "status": 200, "user": dict(user_dict)}
+        for indexes in pending.values():
+            for index in indexes:
+                results[index] = {"id": user_ids[index], "status": 404, "error": "User not found"}
+
+    def lookup_response(self, results):
+        found = sum(1 for result in results if result['status'] == 200)
+        return {
+            "found": found,
+            "missing": len(results) - found,
+            "results": results
+        }
+
+    def validate_bulk(self, users):
+        """
+        Validate a bulk payload up front.
+        Returns (error, results, valid_indexes); results holds the per-item
+        failures and None for every item that passed validation.
+        """
+        if not isinstance(users, list) or not users:
+            return "A non-empty list of users is required", None, None
+        if len(users) > BULK_MAX_USERS:
+            return f"At most {BULK_MAX_USERS} users can be created per request", None, None
+        
+        results = [None] * len(users)
+        valid = []
+        for index, data in enumerate(users):
+            error = self.validate_user_data(data)
+            if error:
+                results[index] = {"index": index, "status": 400, "error": error}
+            else:
+                valid.append(index)
+        return None, results, valid
+
+    def build_bulk_documents(self, users, valid, password_hashes):
+        """Build raw documents ready for insert_many, paired with their input index"""
+        documents = []
+        for index, password_hash in zip(valid, password_hashes):
+            document = User(
+                name=self.normalize_name(users[index]['name']),
+                email=users[index]['email'],
+                email_key=User.email_key_for(users[index]['email']),
+                password=password_hash
+            ).to_mongo().to_dict()
+            document['_id'] = ObjectId()
+            documents.append((index, document))
+        return documents
+
+    def bulk_chunks(self, documents):
+        for start in range(0, len(documents), BULK_CHUNK_SIZE):
+            yield documents[start:start + BULK_CHUNK_SIZE]
+
+    def bulk_write_failures(self, details):
+        """Map the writeErrors of a BulkWriteError to {position in chunk: message}"""
+        failed = {}
+        for write_error in details.get('writeErrors', []):
+            if write_error.get('code') == DUPLICATE_KEY_ERROR:
+                failed[write_error['index']] = "A user with this email already exists"
+            else:
+                failed[write_error['index']] = write_error.get('errmsg', 'Write failed')
+        return failed
+
+    def record_bulk_chunk(self, results, chunk, failed):
+        """Fill the per-item results of a written chunk and warm the read cache"""
+        for position, (index, document) in enumerate(chunk):
+            if position in failed:
+                results[index] = {"index": index, "status": 400, "error": failed[position]}
+                continue
+            user_dict = User.to_public_dict(document)
+            self.cache.set(user_dict['_id'], user_dict)
+            self.emails.add(document['email'])
+            results[index] = {"index": index, "status": 201, "user": dict(user_dict)}
+
+    def record_bulk_abort(self, results, chunks, error):
+        """Mark the items of chunks that were not (or not surely) written as failed"""
+        for chunk in chunks:
+            for index, _ in chunk:
+                results[index] = {"index": index, "status": 500, "error": error}
+
+    def bulk_response(self, results):
+        created = sum(1 for result in results if result['status'] == 201)
+        response = {
+            "created": created,
+            "failed": len(results) - created,
+            "results": results
+        }
+        return response, 201 if created == len(results) else 207
@@ -1,9 +1,43 @@
 from mongoengine import Document, StringField, EmailField
+from .EmailKey import email_key_for
 
 class User(Document):
-    meta = {'collection': 'users'}
+    meta = {
+        'collection': 'users',
+        # Indexes are created by the explicit sync step (flask sync-indexes),
+        # never lazily by whichever request touches the collection first
+        'auto_create_index': False,
+        'indexes': [
+            # Prefix-filtered listings page in (field, _id) order straight off these indexes
+            {'fields': ['name', '_id']},
+            {'fields': ['email', '_id']}
+        ]
+    }
     name = StringField(required=True)
+    # Email as submitted; its unique index serves exact lookups on documents
+    # the email_key backfill hasn't reached yet
     email = EmailField(required=True, unique=True)
+    # Canonical (trimmed, lowercased) email used by login and duplicate checks.
+    # Sparse so documents created before the field existed don't collide
+    email_key = StringField(unique=True, sparse=True)
     password = StringField(required=True)
 
+    # Fields that may be returned to API clients
+    public_fields = ('name', 'email')
+
+    email_key_for = staticmethod(email_key_for)
+
+    @classmethod
+    def public_projection(cls, *extra_fields):
+        """Mongo projection selecting only the public fields (plus any extras)"""
+        return {field: 1 for field in cls.public_fields + extra_fields}
+
+    @classmethod
+    def to_public_dict(cls, raw):
+        """Build the API representation straight from a raw BSON document"""
+        user_dict = {'_id': str(raw['_id'])}
+        for field in cls.public_fields:
+            user_dict[field] = raw.get(field)
+        return user_dict
+
 
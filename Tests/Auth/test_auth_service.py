@@ -1,11 +1,10 @@
 import unittest
 from unittest.mock import patch, MagicMock
 import bcrypt
-import json
 from bson import ObjectId
 from mongoengine import connect, disconnect
 from Modules.Auth.Services.AuthService import AuthService
-from Modules.Users.User import User
+from Modules.Core.RateLimiter import LoginLimiter, SlidingWindowLimiter
 
 class TestAuthService(unittest.TestCase):
     
@@ -38,30 +37,47 @@ class TestAuthService(unittest.TestCase):
         self.mock_user.name = self.test_user['name']
         self.mock_user.email = self.test_user['email']
         self.mock_user.password = self.hashed_password
+        
+        self.raw_user = {
+            '_id': ObjectId(self.user_id),
+            'name': self.test_user['name'],
+            'email': self.test_user['email'],
+            'password': self.hashed_password
+        }
 
-    @patch('Modules.Auth.Services.AuthService.User.objects.get')
+    @patch('Modules.Auth.Services.AuthService.User._get_collection')
     @patch('Modules.Auth.Services.AuthService.create_access_token')
     @patch('bcrypt.checkpw')
-    def test_login_success(self, mock_checkpw, mock_create_token, mock_user_get):
-        mock_user_get.return_value = self.mock_user
+    def test_login_success(self, mock_checkpw, mock_create_token, mock_get_collection):
+        mock_find_one = mock_get_collection.return_value.find_one
+        mock_find_one.return_value = self.raw_user
         mock_checkpw.return_value = True
         mock_create_token.return_value = "mocked_jwt_token"
         
         result, status_code = self.auth_service.login(self.test_user['email'], self.test_password)
         
-        self.assertEqual(resul['access_token'], "mocked_jwt_token")
+        self.assertEqual(status_code, 200)
+        self.assertEqual(result['access_token'], "mocked_jwt_token")
         self.assertEqual(result['user']['id'], self.user_id)
         self.assertEqual(result['user']['name'], self.test_user['name'])
         self.assertEqual(result['user']['email'], self.test_user['email'])
         
-        mock_user_get.assert_called_once_with(email=self.test_user['email'])
+        self.assertNotIn('password', result['user'])
+        
+        mock_find_one.assert_called_once_with(
+            {'$or': [
+                {'email_key': self.test_user['email']},
+                {'email': self.test_user['email'], 'email_key': {'$exists': False}}
+            ]},
+            {'name': 1, 'email': 1, 'password': 1}
+        )
         mock_checkpw.assert_called_once_with(self.test_password.encode('utf-8'), self.hashed_password.encode('utf-8'))
         mock_create_token.assert_called_once_with(identity=self.user_id)
 
-    @patch('Modules.Auth.Services.AuthService.User.objects.get')
+    @patch('Modules.Auth.Services.AuthService.User._get_collection')
     @patch('bcrypt.checkpw')
-    def test_login_invalid_password(self, mock_checkpw, mock_user_get):
-        mock_user_get.return_value = self.mock_user
+    def test_login_invalid_password(self, mock_checkpw, mock_get_collection):
+        mock_get_collection.return_value.find_one.return_value = self.raw_user
         mock_checkpw.return_value = False
         
         result, status_code = self.auth_service.login(self.test_user['email'], "wrong_password")
@@ -69,15 +85,35 @@ class TestAuthService(unittest.TestCase):
         self.assertEqual(status_code, 401)
         self.assertEqual(result['error'], "Invalid credentials")
 
-    @patch('Modules.Auth.Services.AuthService.User.objects.get')
-    def test_login_user_not_found(self, mock_user_get):
-        mock_user_get.side_effect = User.DoesNotExist()
+    @patch('Modules.Auth.Services.AuthService.User._get_collection')
+    def test_login_user_not_found(self, mock_get_collection):
+        mock_get_collection.return_value.find_one.return_value = None
         
         result, status_code = self.auth_service.login("nonexistent@example.com", self.test_password)
         
         self.assertEqual(status_code, 401)
         self.assertEqual(result['error'], "Invalid credentials")
 
+    @patch('Modules.Auth.Services.AuthService.User._get_collection')
+    @patch('Modules.Auth.Services.AuthService.create_access_token')
+    @patch('bcrypt.checkpw')
+    def test_login_matches_backfilled_email_in_any_casing(self, mock_checkpw, mock_create_token, mock_get_collection):
+        import mongomock
+        collection = mongomock.MongoClient().db.users
+        collection.insert_one(dict(self.raw_user, email='Test@Example.com', email_key='test@example.com'))
+        mock_get_collection.return_value = collection
+        mock_checkpw.return_value = True
+        mock_create_token.return_value = "mocked_jwt_token"
+        auth_service = AuthService(limiter=LoginLimiter(SlidingWindowLimiter(limit=1), SlidingWindowLimiter(limit=100)))
+        
+        result, status_code = auth_service.login(' TEST@example.COM', self.test_password)
+        
+        self.assertEqual(status_code, 200)
+        self.assertEqual(result['user']['id'], self.user_id)
+        # The canonical key also throttles: another casing of the same address shares its budget
+        _, status_code = auth_service.login('test@EXAMPLE.com', self.test_password)
+        self.assertEqual(status_code, 429)
+    
     def test_login_missing_credentials(self):
         result, status_code = self.auth_service.login("", self.test_password)
         self.assertEqual(status_code, 400)
@@ -87,6 +123,44 @@ class TestAuthService(unittest.TestCase):
         self.assertEqual(status_code, 400)
         self.assertEqual(result['error'], "Email and password are required")
 
+    def test_login_rejects_non_string_credentials(self):
+        for email, password in ((123, 'pw'), (['a@b.c'], 'pw'), ('a@b.c', {'$ne': ''})):
+            result, status_code = self.auth_service.login(email, password)
+            self.assertEqual(status_code, 400)
+            self.assertEqual(result['error'], "Email and password must be strings")
+
+    @patch('Modules.Auth.Services.AuthService.User._get_collection')
+    @patch('Modules.Auth.Services.AuthService.create_access_token')
+    def test_login_rehashes_stale_cost(self, mock_create_token, mock_get_collection):
+        mock_get_collection.return_value.find_one.return_value = self.raw_user
+        mock_create_token.return_value = "mocked_jwt_token"
+        mock_hasher = MagicMock()
+        mock_hasher.check.return_value = True
+        mock_hasher.needs_rehash.return_value = True
+        mock_hasher.rehash_in_background.side_effect = lambda password, on_hashed: on_hashed('new-hash')
+        auth_service = AuthService(hasher=mock_hasher, limiter=MagicMock(**{'check.return_value': (True, 0)}))
+        
+        result, status_code = auth_service.login(self.test_user['email'], self.test_password)
+        
+        self.assertEqual(status_code, 200)
+        mock_get_collection.return_value.update_one.assert_called_once_with(
+            {'_id': self.raw_user['_id'], 'password': self.hashed_password},
+            {'$set': {'password': 'new-hash'}}
+        )
+
+    @patch('Modules.Auth.Services.AuthService.User._get_collection')
+    def test_login_throttled_before_lookup(self, mock_get_collection):
+        mock_limiter = MagicMock()
+        mock_limiter.check.return_value = (False, 30)
+        auth_service = AuthService(limiter=mock_limiter)
+        
+        result, status_code = auth_service.login(self.test_user['email'], self.test_password, '10.0.0.1')
+        
+        self.assertEqual(status_code, 429)
+        self.assertEqual(result['retry_after'], 30)
+        mock_limiter.check.assert_called_once_with(self.test_user['email'], '10.0.0.1')
+        mock_get_collection.assert_not_called()
+
     @patch('Modules.Auth.Services.AuthService.UserService.create')
     @patch('Modules.Auth.Services.AuthService.create_access_token')
     def test_register_success(self, mock_create_token, mock_user_create):
@@ -0,0 +1,29 @@
+import unittest
+from Modules.Core.BloomFilter import BloomFilter
+
+class TestBloomFilter(unittest.TestCase):
+
+    def test_added_items_are_always_found(self):
+        bloom = BloomFilter(capacity=1000, error_rate=0.01)
+        items = [f'user{i}@example.com' for i in range(1000)]
+        for item in items:
+            bloom.add(item)
+        self.assertTrue(all(item in bloom for item in items))
+        self.assertEqual(bloom.stats()['count'], 1000)
+
+    def test_false_positive_rate_near_target(self):
+        bloom = BloomFilter(capacity=1000, error_rate=0.01)
+        for i in range(1000):
+            bloom.add(f'user{i}@example.com')
+        false_positives = sum(f'other{i}@example.com' in bloom for i in range(10000))
+        self.assertLess(false_positives, 300)
+
+    def test_clear(self):
+        bloom = BloomFilter(capacity=10)
+        bloom.add('a')
+        bloom.clear()
+        self.assertNotIn('a', bloom)
+
+
+if __name__ == '__main__':
+    unittest.main()
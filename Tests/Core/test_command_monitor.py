@@ -0,0 +1,53 @@
+import json
+import unittest
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+from bson import ObjectId
+from Modules.Core.CommandMonitor import CommandMonitor, command_duration, command_shape, redact
+from Modules.Core.Metrics import current_endpoint
+
+class TestCommandMonitor(unittest.TestCase):
+
+    def setUp(self):
+        self.logger = MagicMock()
+        self.monitor = CommandMonitor(slow_threshold_ms=50, logger=self.logger)
+
+    def run_command(self, command_name, command, duration_micros, request_id=1):
+        self.monitor.started(SimpleNamespace(
+            command_name=command_name, command=command, connection_id=('localhost', 27017),
+            request_id=request_id, database_name='omninext'))
+        self.monitor.succeeded(SimpleNamespace(
+            command_name=command_name, connection_id=('localhost', 27017), request_id=request_id,
+            duration_micros=duration_micros, database_name='omninext'))
+
+    def test_redact_keeps_shape_only(self):
+        query = {'$or': [{'email': 'a@example.com'}, {'_id': {'$in': [ObjectId(), ObjectId()]}}], 'age': {'$gt': 3}}
+        self.assertEqual(redact(query), {'$or': [{'email': '?'}, {'_id': {'$in': '?'}}], 'age': {'$gt': '?'}})
+
+    def test_update_shape_uses_first_statement(self):
+        shape = command_shape('update', {'update': 'users', 'updates': [{'q': {'_id': 1}, 'u': {'$set': {'password': 'x'}}}]})
+        self.assertEqual(shape, {'filter': {'_id': '?'}, 'statements': 1})
+
+    def test_fast_command_is_timed_not_logged(self):
+        before = command_duration.count('find', 'users')
+        self.run_command('find', {'find': 'users', 'filter': {'email': 'a@example.com'}}, 1000)
+        self.assertEqual(command_duration.count('find', 'users'), before + 1)
+        self.logger.warning.assert_not_called()
+
+    def test_slow_command_logged_with_route_and_redacted_filter(self):
+        token = current_endpoint.set('/api/auth/login')
+        try:
+            self.run_command('find', {'find': 'users', 'filter': {'email': 'secret@example.com'}}, 120000)
+        finally:
+            current_endpoint.reset(token)
+
+        record = json.loads(self.logger.warning.call_args[0][0])
+        self.assertEqual(record['endpoint'], '/api/auth/login')
+        self.assertEqual(record['collection'], 'users')
+        self.assertEqual(record['duration_ms'], 120.0)
+        self.assertEqual(record['shape'], {'filter': {'email': '?'}})
+        self.assertNotIn('secret', self.logger.warning.call_args[0][0])
+
+
+if __name__ == '__main__':
+    unittest.main()
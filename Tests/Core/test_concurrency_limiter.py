@@ -0,0 +1,102 @@
+import unittest
+from unittest.mock import patch
+from flask import Flask
+from Modules.Core.ConcurrencyLimiter import AdaptiveLimiter, ROUTE_BUDGETS, build_limiters, init_app
+from Modules.Core.Metrics import registry
+
+class TestAdaptiveLimiter(unittest.TestCase):
+
+    def test_rejects_over_limit(self):
+        limiter = AdaptiveLimiter('test', initial_limit=2)
+        self.assertTrue(limiter.try_acquire())
+        self.assertTrue(limiter.try_acquire())
+        self.assertFalse(limiter.try_acquire())
+        limiter.release(0.01)
+        self.assertTrue(limiter.try_acquire())
+        self.assertEqual(limiter.stats()['rejected'], 1)
+
+    def test_additive_increase_multiplicative_decrease(self):
+        limiter = AdaptiveLimiter('test', initial_limit=10, max_limit=20, target_latency=0.1, backoff=0.5)
+        for _ in range(10):
+            limiter.try_acquire()
+            limiter.release(0.01)
+        self.assertEqual(limiter.limit, 10)
+        limiter.try_acquire()
+        limiter.release(0.01)
+        self.assertEqual(limiter.limit, 11)
+
+        limiter.try_acquire()
+        limiter.release(0.5)
+        self.assertEqual(limiter.limit, 5)
+        limiter.try_acquire()
+        limiter.release(0.01, failed=True)
+        self.assertEqual(limiter.limit, 2)
+
+    def test_limit_stays_within_bounds(self):
+        limiter = AdaptiveLimiter('test', initial_limit=2, min_limit=2, max_limit=2)
+        limiter.try_acquire()
+        limiter.release(10)
+        self.assertEqual(limiter.limit, 2)
+        limiter.try_acquire()
+        limiter.release(0)
+        self.assertEqual(limiter.limit, 2)
+
+class TestBuildLimiters(unittest.TestCase):
+
+    @patch.dict('os.environ', {'WEB_THREADS': '4', 'CONCURRENCY_AUTH_MAX': '64'}, clear=True)
+    def test_auth_budget_leaves_a_thread_for_reads(self):
+        limiters = build_limiters()
+        self.assertEqual(limiters['auth'].max_limit, 3)
+        self.assertEqual(limiters['auth'].limit, 3)
+        self.assertEqual(limiters['users'].max_limit, 500)
+
+    @patch.dict('os.environ', {}, clear=True)
+    def test_auth_budget_uncapped_without_thread_count(self):
+        self.assertEqual(build_limiters()['auth'].max_limit, 64)
+        self.assertEqual(build_limiters(threads=1)['auth'].max_limit, 1)
+
+    @patch.dict('os.environ', {}, clear=True)
+    def test_bulk_has_its_own_budget(self):
+        limiters = build_limiters()
+        self.assertEqual(ROUTE_BUDGETS['/api/users/bulk'], 'bulk')
+        limiters['bulk'].try_acquire()
+        limiters['bulk'].release(15)
+        # A 15s batch is within the bulk target, and it never touches the login budget
+        self.assertEqual(limiters['bulk'].limit, 2)
+        self.assertEqual(limiters['auth'].limit, 8)
+
+class TestConcurrencyLimiterApp(unittest.TestCase):
+
+    def setUp(self):
+        self.app = Flask(__name__)
+        self.limiters = {
+            'auth': AdaptiveLimiter('auth', initial_limit=1, retry_after=3),
+            'users': AdaptiveLimiter('users', initial_limit=1)
+        }
+        init_app(self.app, self.limiters)
+        self.app.add_url_rule('/api/auth/login', 'login', lambda: 'ok', methods=['POST'])
+        self.app.add_url_rule('/api/users', 'users', lambda: 'ok')
+        self.client = self.app.test_client()
+
+    def test_budget_exhausted_sheds_with_retry_after(self):
+        self.limiters['auth'].try_acquire()
+
+        response = self.client.post('/api/auth/login')
+
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(response.headers['Retry-After'], '3')
+        # A burst on the bcrypt routes leaves the read budget untouched
+        self.assertEqual(self.client.get('/api/users').status_code, 200)
+
+    def test_slot_released_after_request(self):
+        self.assertEqual(self.client.get('/api/users').status_code, 200)
+        self.assertEqual(self.client.get('/api/users').status_code, 200)
+        self.assertEqual(self.limiters['users'].stats()['in_flight'], 0)
+
+    def test_collectors_are_not_duplicated_across_apps(self):
+        init_app(Flask(__name__), self.limiters)
+        output = registry.render()
+        self.assertEqual(output.count('omninext_concurrency_limit{budget="auth"}'), 1)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,38 @@
+import unittest
+from unittest.mock import patch
+from Modules.Core import Database
+
+class TestDatabase(unittest.TestCase):
+
+    def setUp(self):
+        Database._connected = False
+        Database._warmed_up = False
+
+    def tearDown(self):
+        Database._connected = False
+        Database._warmed_up = False
+
+    @patch.dict('os.environ', {'MONGO_URI': 'mongodb://db:27017/omninext', 'MONGO_MAX_POOL_SIZE': '20'})
+    @patch('mongoengine.connect')
+    def test_connects_lazily_once_with_pool_settings(self, mock_connect):
+        Database.ensure_connected()
+        Database.ensure_connected()
+        
+        mock_connect.assert_called_once()
+        kwargs = mock_connect.call_args[1]
+        self.assertFalse(kwargs['connect'])
+        self.assertEqual(kwargs['host'], 'mongodb://db:27017/omninext')
+        self.assertEqual(kwargs['maxPoolSize'], 20)
+
+    @patch('mongoengine.disconnect')
+    @patch('mongoengine.connect')
+    def test_reset_after_fork_reconnects_on_next_use(self, mock_connect, mock_disconnect):
+        Database.ensure_connected()
+        Database.reset_after_fork()
+        Database.ensure_connected()
+        
+        mock_disconnect.assert_called_once_with(alias='default')
+        self.assertEqual(mock_connect.call_count, 2)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,45 @@
+import unittest
+from mongoengine import connect, disconnect
+from Modules.Core import IndexManager
+from Modules.Users.User import User
+
+class TestIndexManager(unittest.TestCase):
+    
+    @classmethod
+    def setUpClass(cls):
+        disconnect()
+        import mongomock
+        connect('indexmanagertest', host='localhost', mongo_client_class=mongomock.MongoClient)
+    
+    @classmethod
+    def tearDownClass(cls):
+        disconnect()
+    
+    def setUp(self):
+        User.drop_collection()
+    
+    def test_collection_access_does_not_create_indexes(self):
+        User._get_collection().find_one({})
+        self.assertEqual(User._get_collection().index_information(), {})
+    
+    def test_sync_creates_missing_indexes(self):
+        report = IndexManager.sync_indexes(check_only=True)
+        self.assertIn([('email', 1)], report['users']['missing'])
+        
+        IndexManager.sync_indexes()
+        
+        report = IndexManager.sync_indexes(check_only=True)
+        self.assertFalse(IndexManager.has_drift(report))
+        self.assertTrue(User._get_collection().index_information()['email_1']['unique'])
+    
+    def test_reports_and_drops_extra_indexes(self):
+        IndexManager.sync_indexes()
+        User._get_collection().create_index('password')
+        
+        report = IndexManager.sync_indexes(drop_extra=True)
+        
+        self.assertEqual(report['users']['extra'], [[('password', 1)]])
+        self.assertNotIn('password_1', User._get_collection().index_information())
+
+if __name__ == '__main__':
+    unittest.main()
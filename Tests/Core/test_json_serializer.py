@@ -0,0 +1,56 @@
+import json
+import unittest
+from datetime import datetime
+from unittest.mock import MagicMock
+from bson import ObjectId
+from Modules.Core.JsonSerializer import JsonSerializer, compile_model_encoder, orjson
+
+class TestJsonSerializer(unittest.TestCase):
+
+    def setUp(self):
+        self.user = {'_id': '507f1f77bcf86cd799439011', 'name': 'Mario "Rossi"', 'email': 'mario@example.com'}
+
+    def test_compiled_model_encoder_matches_stdlib(self):
+        encode = compile_model_encoder(('_id', 'name', 'email'))
+        self.assertEqual(json.loads(encode(self.user)), self.user)
+
+    def test_compiled_backend_handles_nested_payloads(self):
+        serializer = JsonSerializer('compiled')
+        serializer.register_model(('_id', 'name', 'email'))
+        payload = {
+            'users': [self.user],
+            'next_cursor': None,
+            'owner': ObjectId('507f1f77bcf86cd799439011'),
+            'created_at': datetime(2024, 1, 2, 3, 4, 5),
+            'active': True,
+            'count': 1
+        }
+        
+        decoded = json.loads(serializer.dumps(payload))
+        
+        self.assertEqual(decoded['users'][0], self.user)
+        self.assertIsNone(decoded['next_cursor'])
+        self.assertEqual(decoded['owner'], '507f1f77bcf86cd799439011')
+        self.assertEqual(decoded['created_at'], '2024-01-02T03:04:05')
+        self.assertIs(decoded['active'], True)
+
+    def test_compiled_backend_encodes_enveloped_models(self):
+        serializer = JsonSerializer('compiled')
+        serializer.register_model(('_id', 'name', 'email'))
+        fields = ('_id', 'name', 'email')
+        encoder = MagicMock(side_effect=serializer._model_encoders[fields])
+        serializer._model_encoders[fields] = encoder
+        
+        data = serializer.dumps({'user': self.user})
+        
+        encoder.assert_called_once_with(self.user)
+        self.assertEqual(json.loads(data), {'user': self.user})
+
+    @unittest.skipIf(orjson is None, 'orjson not installed')
+    def test_orjson_backend_handles_object_ids(self):
+        serializer = JsonSerializer('orjson')
+        decoded = json.loads(serializer.dumps({'user': dict(self.user, _id=ObjectId(self.user['_id']))}))
+        self.assertEqual(decoded['user'], self.user)
+
+if __name__ == '__main__':
+    unittest.main()
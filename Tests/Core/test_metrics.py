@@ -0,0 +1,92 @@
+import time
+import unittest
+from flask import Flask
+from Modules.Core import Metrics
+from Modules.Core.Metrics import MetricsRegistry, current_endpoint, stage, stage_duration, timed_service, service_responses_total
+
+class TestMetrics(unittest.TestCase):
+
+    def setUp(self):
+        self.registry = MetricsRegistry()
+
+    def test_histogram_renders_cumulative_buckets(self):
+        histogram = self.registry.histogram('latency_seconds', 'Latency', ('endpoint',), buckets=(0.1, 1.0))
+        histogram.observe(0.05, '/a')
+        histogram.observe(0.5, '/a')
+        histogram.observe(5, '/a')
+        
+        output = self.registry.render()
+        
+        self.assertIn('# TYPE latency_seconds histogram', output)
+        self.assertIn('latency_seconds_bucket{endpoint="/a",le="0.1"} 1', output)
+        self.assertIn('latency_seconds_bucket{endpoint="/a",le="1.0"} 2', output)
+        self.assertIn('latency_seconds_bucket{endpoint="/a",le="+Inf"} 3', output)
+        self.assertIn('latency_seconds_count{endpoint="/a"} 3', output)
+
+    def test_counter_escapes_label_values(self):
+        counter = self.registry.counter('events_total', 'Events', ('name',))
+        counter.inc('say "hi"')
+        self.assertIn('events_total{name="say \\"hi\\""} 1', self.registry.render())
+
+    def test_timed_service_counts_returned_status(self):
+        class FakeService:
+            @timed_service
+            def lookup(self):
+                return {"error": "User not found"}, 404
+        
+        before = service_responses_total.value('TestMetrics.test_timed_service_counts_returned_status.<locals>.FakeService.lookup', '404')
+        FakeService().lookup()
+        after = service_responses_total.value('TestMetrics.test_timed_service_counts_returned_status.<locals>.FakeService.lookup', '404')
+        self.assertEqual(after - before, 1)
+
+    def test_stage_is_labelled_with_current_endpoint(self):
+        token = current_endpoint.set('/test/endpoint')
+        try:
+            with stage('database'):
+                pass
+        finally:
+            current_endpoint.reset(token)
+        self.assertEqual(stage_duration.count('/test/endpoint', 'database'), 1)
+
+    def test_nested_service_records_service_stage_once(self):
+        class FakeService:
+            @timed_service
+            def create(self):
+                return {"id": "1"}, 201
+
+            @timed_service
+            def register(self):
+                return self.create()
+
+        token = current_endpoint.set('/test/nested')
+        try:
+            FakeService().register()
+        finally:
+            current_endpoint.reset(token)
+        self.assertEqual(stage_duration.count('/test/nested', 'service'), 1)
+        self.assertEqual(service_responses_total.value(
+            'TestMetrics.test_nested_service_records_service_stage_once.<locals>.FakeService.create', '201'), 1)
+
+    def test_controller_stage_excludes_service_time(self):
+        class SlowService:
+            @timed_service
+            def fetch(self):
+                time.sleep(0.05)
+                return {}, 200
+
+        app = Flask(__name__)
+        Metrics.init_app(app)
+
+        @app.route('/test/controller')
+        def view():
+            body, status = SlowService().fetch()
+            return body, status
+
+        app.test_client().get('/test/controller')
+
+        self.assertGreaterEqual(stage_duration.total('/test/controller', 'service'), 0.05)
+        self.assertLess(stage_duration.total('/test/controller', 'controller'), 0.05)
+        self.assertGreaterEqual(Metrics.request_duration.total('GET', '/test/controller'), 0.05)
+
+if __name__ == '__main__':
+    unittest.main()
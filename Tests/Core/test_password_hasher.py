@@ -0,0 +1,65 @@
+import unittest
+from threading import Event, Thread
+from Modules.Core.PasswordHasher import PasswordHasher, HashingQueueFull
+
+class TestPasswordHasher(unittest.TestCase):
+
+    def setUp(self):
+        self.hasher = PasswordHasher(max_workers=1, max_queue=1, timeout=5, rounds=4)
+
+    def tearDown(self):
+        self.hasher.shutdown()
+
+    def test_hash_and_check(self):
+        password_hash = self.hasher.hash("password123")
+        self.assertTrue(self.hasher.check("password123", password_hash))
+        self.assertFalse(self.hasher.check("wrong", password_hash))
+        stats = self.hasher.stats()
+        self.assertEqual(stats['completed'], 3)
+        self.assertGreater(stats['exec_total'], 0)
+
+    def test_uses_configured_cost(self):
+        password_hash = self.hasher.hash("password123")
+        self.assertTrue(password_hash.startswith("$2b$04$"))
+        self.assertFalse(self.hasher.needs_rehash(password_hash))
+        self.assertTrue(PasswordHasher(max_workers=1, rounds=5).needs_rehash(password_hash))
+
+    def test_calibrate_picks_cost_within_bounds(self):
+        rounds = self.hasher.calibrate(target_seconds=0.0, min_rounds=4, max_rounds=6)
+        self.assertEqual(rounds, 4)
+        self.assertEqual(self.hasher.rounds, 4)
+        rounds = self.hasher.calibrate(target_seconds=60.0, min_rounds=4, max_rounds=6)
+        self.assertEqual(rounds, 6)
+
+    def test_rejects_when_saturated(self):
+        release = Event()
+        running = self.hasher.submit(release.wait)
+        queued = self.hasher.submit(release.wait)
+        
+        with self.assertRaises(HashingQueueFull):
+            self.hasher.submit(release.wait)
+        
+        release.set()
+        running.result(timeout=5)
+        queued.result(timeout=5)
+        self.assertEqual(self.hasher.stats()['rejected'], 1)
+
+    def test_hash_many_leaves_the_queue_to_other_callers(self):
+        hasher = PasswordHasher(max_workers=1, max_queue=4, timeout=5, rounds=4)
+        self.addCleanup(hasher.shutdown)
+        hashes = []
+        bulk = Thread(target=lambda: hashes.extend(hasher.hash_many(['pw'] * 30)))
+        bulk.start()
+        release = Event()
+        
+        # A batch holds at most max_workers slots, so every queue slot still admits a login
+        logins = [hasher.submit(release.wait) for _ in range(4)]
+        
+        release.set()
+        bulk.join(timeout=10)
+        self.assertEqual(len(hashes), 30)
+        self.assertTrue(all(login.result(timeout=5) for login in logins))
+        self.assertEqual(hasher.stats()['rejected'], 0)
+
+if __name__ == '__main__':
+    unittest.main()
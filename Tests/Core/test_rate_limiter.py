@@ -0,0 +1,56 @@
+import unittest
+from Modules.Core.RateLimiter import SlidingWindowLimiter, MemoryRateLimitBackend, LoginLimiter
+
+class FakeClock:
+    def __init__(self, now=0.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+class TestSlidingWindowLimiter(unittest.TestCase):
+
+    def setUp(self):
+        self.clock = FakeClock(1000.0)
+        self.backend = MemoryRateLimitBackend(max_keys=2, clock=self.clock)
+        self.limiter = SlidingWindowLimiter(limit=3, window=60, backend=self.backend, clock=self.clock)
+
+    def test_rejects_over_limit(self):
+        for _ in range(3):
+            self.assertTrue(self.limiter.hit('a')[0])
+        allowed, retry_after = self.limiter.hit('a')
+        self.assertFalse(allowed)
+        self.assertGreater(retry_after, 0)
+        self.assertEqual(self.limiter.stats()['rejected'], 1)
+
+    def test_previous_window_is_weighted(self):
+        for _ in range(3):
+            self.limiter.hit('a')
+        # Half-way through the next window half of the previous hits still count
+        self.clock.now = 1020.0 + 30
+        self.assertTrue(self.limiter.hit('a')[0])
+        self.assertFalse(self.limiter.hit('a')[0])
+
+    def test_memory_is_bounded(self):
+        for key in ('a', 'b', 'c'):
+            self.limiter.hit(key)
+        self.assertEqual(self.backend.stats()['keys'], 2)
+        self.assertEqual(self.backend.stats()['evictions'], 1)
+
+    def test_idle_keys_are_evicted(self):
+        self.limiter.hit('a')
+        self.clock.now += 121
+        self.limiter.hit('b')
+        self.assertEqual(self.backend.stats()['keys'], 1)
+
+    def test_login_limiter_keys_on_the_given_email(self):
+        login_limiter = LoginLimiter(
+            email_limiter=SlidingWindowLimiter(limit=1, window=60, clock=self.clock),
+            ip_limiter=SlidingWindowLimiter(limit=10, window=60, clock=self.clock)
+        )
+        self.assertTrue(login_limiter.check('user@example.com', '10.0.0.1')[0])
+        self.assertFalse(login_limiter.check('user@example.com', '10.0.0.2')[0])
+        self.assertTrue(login_limiter.check('other@example.com', '10.0.0.2')[0])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,50 @@
+import os
+import unittest
+from unittest.mock import patch
+from Modules.Core import ServerConfig
+
+class TestServerConfig(unittest.TestCase):
+
+    @patch.dict('os.environ', {}, clear=True)
+    def test_defaults_follow_cpu_count(self):
+        settings = ServerConfig.server_settings(cpu_count=8)
+        self.assertEqual(settings['workers'], 8)
+        self.assertEqual(settings['worker_class'], 'gthread')
+        self.assertEqual(settings['hash_pool_size'], 1)
+        self.assertTrue(settings['preload_app'])
+
+    @patch.dict('os.environ', {'WEB_WORKERS': '2', 'WEB_THREADS': '1', 'WEB_PRELOAD': 'off'}, clear=True)
+    def test_environment_overrides(self):
+        settings = ServerConfig.server_settings(cpu_count=8)
+        self.assertEqual(settings['workers'], 2)
+        self.assertEqual(settings['worker_class'], 'sync')
+        # Cores left over by fewer workers go to each hashing pool
+        self.assertEqual(settings['hash_pool_size'], 4)
+        self.assertFalse(settings['preload_app'])
+
+    def test_should_recycle(self):
+        self.assertFalse(ServerConfig.should_recycle(100, 300, 256))
+        self.assertTrue(ServerConfig.should_recycle(100, 400, 256))
+        self.assertFalse(ServerConfig.should_recycle(100, 4000, 0))
+
+    @patch('Modules.Core.PasswordHasher.calibrate_rounds', return_value=11)
+    def test_calibrate_bcrypt_exports_rounds_once(self, mock_calibrate):
+        from Modules.Core.PasswordHasher import password_hasher
+        original_rounds = password_hasher.rounds
+        try:
+            with patch.dict('os.environ', {'BCRYPT_TARGET_MS': '250'}, clear=True):
+                self.assertEqual(ServerConfig.calibrate_bcrypt(), 11)
+                self.assertEqual(os.environ['BCRYPT_ROUNDS'], '11')
+                # Already exported (or set explicitly): never measured again
+                self.assertIsNone(ServerConfig.calibrate_bcrypt())
+        finally:
+            password_hasher.rounds = original_rounds
+        mock_calibrate.assert_called_once_with(0.25)
+        self.assertEqual(password_hasher.rounds, original_rounds)
+
+    def test_rss_mb(self):
+        self.assertGreater(ServerConfig.rss_mb(), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
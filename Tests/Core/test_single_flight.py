@@ -0,0 +1,91 @@
+import unittest
+import time
+from threading import Event, Thread
+from Modules.Core.SingleFlight import SingleFlight, SingleFlightTimeout
+
+class TestSingleFlight(unittest.TestCase):
+
+    def setUp(self):
+        self.flight = SingleFlight(timeout=2)
+        self.started = Event()
+        self.release = Event()
+
+    def blocking_call(self, value):
+        self.started.set()
+        self.release.wait(2)
+        if isinstance(value, Exception):
+            raise value
+        return value
+
+    def run_waiters(self, count, key='a'):
+        outcomes = []
+
+        def waiter():
+            try:
+                outcomes.append(self.flight.do(key, lambda: 'not-called'))
+            except Exception as e:
+                outcomes.append(e)
+
+        threads = [Thread(target=waiter) for _ in range(count)]
+        for thread in threads:
+            thread.start()
+        return threads, outcomes
+
+    def test_concurrent_calls_share_one_execution(self):
+        leader_result = []
+        leader = Thread(target=lambda: leader_result.append(self.flight.do('a', self.blocking_call, 'value')))
+        leader.start()
+        self.started.wait(2)
+
+        threads, outcomes = self.run_waiters(5)
+        while self.flight.stats()['coalesced'] < 5:
+            time.sleep(0.001)
+        self.release.set()
+        for thread in threads + [leader]:
+            thread.join(2)
+
+        self.assertEqual(leader_result, ['value'])
+        self.assertEqual(outcomes, ['value'] * 5)
+        stats = self.flight.stats()
+        self.assertEqual(stats['executions'], 1)
+        self.assertEqual(stats['coalesced'], 5)
+        self.assertEqual(stats['in_flight'], 0)
+
+    def test_leader_exception_reaches_waiters(self):
+        error = ValueError('boom')
+        leader = Thread(target=lambda: self.assertRaises(ValueError, self.flight.do, 'a', self.blocking_call, error))
+        leader.start()
+        self.started.wait(2)
+
+        threads, outcomes = self.run_waiters(2)
+        while self.flight.stats()['coalesced'] < 2:
+            time.sleep(0.001)
+        self.release.set()
+        for thread in threads + [leader]:
+            thread.join(2)
+
+        self.assertEqual(outcomes, [error, error])
+        self.assertEqual(self.flight.stats()['errors'], 1)
+        # The failed call is not remembered: the next one runs again
+        self.assertEqual(self.flight.do('a', lambda: 'fresh'), 'fresh')
+
+    def test_waiter_times_out(self):
+        self.flight.timeout = 0.01
+        leader = Thread(target=self.flight.do, args=('a', self.blocking_call, 'value'))
+        leader.start()
+        self.started.wait(2)
+
+        with self.assertRaises(SingleFlightTimeout):
+            self.flight.do('a', lambda: 'not-called')
+        self.release.set()
+        leader.join(2)
+        self.assertEqual(self.flight.stats()['timeouts'], 1)
+
+    def test_collect_renders_counters(self):
+        self.flight.do('a', lambda: 1)
+        lines = self.flight.collect()
+        self.assertIn('omninext_singleflight_executions_total{flight="default"} 1', lines)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,49 @@
+import unittest
+from unittest.mock import patch
+from flask import Flask
+from flask_jwt_extended import JWTManager, create_access_token, get_jwt_identity, verify_jwt_in_request
+from Modules.Core.VerifiedTokenCache import VerifiedTokenCache, cached_jwt_required
+
+class TestVerifiedTokenCache(unittest.TestCase):
+
+    def setUp(self):
+        self.app = Flask(__name__)
+        self.app.config['JWT_SECRET_KEY'] = 'test-secret-key-with-enough-length!'
+        JWTManager(self.app)
+        self.token_cache = VerifiedTokenCache(max_size=10)
+        
+        @self.app.route('/protected')
+        @cached_jwt_required(cache=self.token_cache)
+        def protected():
+            return {"identity": get_jwt_identity()}
+        
+        with self.app.app_context():
+            self.token = create_access_token(identity='user-1')
+        self.client = self.app.test_client()
+        self.headers = {'Authorization': f'Bearer {self.token}'}
+
+    @patch('Modules.Core.VerifiedTokenCache.verify_jwt_in_request', wraps=verify_jwt_in_request)
+    def test_repeat_requests_skip_verification(self, mock_verify):
+        first = self.client.get('/protected', headers=self.headers)
+        second = self.client.get('/protected', headers=self.headers)
+        
+        self.assertEqual(first.status_code, 200)
+        self.assertEqual(second.get_json()['identity'], 'user-1')
+        mock_verify.assert_called_once()
+        self.assertEqual(self.token_cache.stats()['hits'], 1)
+
+    def test_secret_rotation_flushes_cache(self):
+        self.client.get('/protected', headers=self.headers)
+        self.app.config['JWT_SECRET_KEY'] = 'rotated-secret-key-with-enough-length'
+        
+        response = self.client.get('/protected', headers=self.headers)
+        
+        self.assertNotEqual(response.status_code, 200)
+        self.assertEqual(self.token_cache.stats()['size'], 0)
+
+    def test_missing_token_is_rejected(self):
+        response = self.client.get('/protected')
+        self.assertEqual(response.status_code, 401)
+
+if __name__ == '__main__':
+    unittest.main()
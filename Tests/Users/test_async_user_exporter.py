@@ -0,0 +1,47 @@
+import gzip
+import json
+import unittest
+from unittest.mock import AsyncMock, MagicMock
+from bson import ObjectId
+from Modules.Users.Services.AsyncUserExporter import AsyncUserExporter
+
+class FakeAsyncCursor:
+
+    def __init__(self, documents):
+        self.documents = documents
+        self.close = AsyncMock()
+
+    def sort(self, key, direction):
+        self.documents = sorted(self.documents, key=lambda document: document[key], reverse=direction < 0)
+        return self
+
+    async def __aiter__(self):
+        for document in self.documents:
+            yield document
+
+class TestAsyncUserExporter(unittest.IsolatedAsyncioTestCase):
+
+    def setUp(self):
+        self.ids = sorted(ObjectId() for _ in range(3))
+        self.cursor = FakeAsyncCursor([
+            {'_id': user_id, 'name': f'User {i}', 'email': f'user{i}@example.com'}
+            for i, user_id in reversed(list(enumerate(self.ids)))
+        ])
+        self.collection = MagicMock()
+        self.collection.find.return_value = self.cursor
+        self.exporter = AsyncUserExporter(collection=self.collection)
+
+    async def export(self, **kwargs):
+        return b''.join([chunk async for chunk in self.exporter.iter_chunks(**kwargs)])
+
+    async def test_export_streams_gzip_ndjson_in_id_order(self):
+        data = await self.export(after=self.ids[0], batch_size=2, compress=True)
+
+        users = [json.loads(line) for line in gzip.decompress(data).decode('utf-8').splitlines()]
+        self.assertEqual([user['_id'] for user in users], [str(user_id) for user_id in self.ids])
+        self.collection.find.assert_called_once_with(
+            {'_id': {'$gt': self.ids[0]}}, {'name': 1, 'email': 1}, batch_size=2)
+        self.cursor.close.assert_awaited_once()
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,87 @@
+import unittest
+from unittest.mock import AsyncMock, MagicMock
+from bson import ObjectId
+from pymongo.errors import DuplicateKeyError
+from Modules.Users.Services.AsyncUserService import AsyncUserService
+from Modules.Core.LRUCache import LRUCache
+from Modules.Users.Services.EmailFilter import EmailFilter
+
+class TestAsyncUserService(unittest.IsolatedAsyncioTestCase):
+    
+    def setUp(self):
+        self.collection = MagicMock()
+        self.collection.find_one = AsyncMock()
+        self.collection.insert_one = AsyncMock()
+        
+        self.hasher = MagicMock()
+        self.hasher.hash_async = AsyncMock(return_value='hashed')
+        
+        emails = EmailFilter(capacity=100)
+        emails.load([])
+        self.user_service = AsyncUserService(collection=self.collection, cache=LRUCache(), hasher=self.hasher, emails=emails)
+    
+    async def test_find_by_id_existing_user(self):
+        self.collection.find_one.return_value = {
+            '_id': ObjectId('507f1f77bcf86cd799439011'),
+            'name': 'Test User',
+            'email': 'test@example.com'
+        }
+        
+        response, status_code = await self.user_service.find_by_id('507f1f77bcf86cd799439011')
+        
+        self.assertEqual(status_code, 200)
+        self.assertEqual(response['user']['_id'], '507f1f77bcf86cd799439011')
+        self.collection.find_one.assert_awaited_once_with(
+            {'_id': ObjectId('507f1f77bcf86cd799439011')},
+            {'name': 1, 'email': 1}
+        )
+    
+    async def test_find_by_id_caches_under_canonical_id(self):
+        object_id = ObjectId('507f1f77bcf86cd799439011')
+        self.collection.find_one.return_value = {'_id': object_id, 'name': 'Test User', 'email': 'test@example.com'}
+        
+        # A non-str id resolves to the same user but must not create a second cache entry
+        await self.user_service.find_by_id(object_id)
+        
+        self.assertIsNone(self.user_service.cache.get(object_id))
+        self.assertEqual(self.user_service.cache.get(str(object_id))['name'], 'Test User')
+    
+    async def test_create_valid_user(self):
+        response, status_code = await self.user_service.create({
+            'name': 'nuovo utente',
+            'email': 'nuovo@example.com',
+            'password': 'password123'
+        })
+        
+        self.assertEqual(status_code, 201)
+        self.assertEqual(response['user']['name'], 'Nuovo Utente')
+        self.assertNotIn('password', response['user'])
+        inserted = self.collection.insert_one.await_args[0][0]
+        self.assertEqual(inserted['password'], 'hashed')
+    
+    async def test_create_user_duplicate_email(self):
+        self.collection.insert_one.side_effect = DuplicateKeyError('E11000')
+        
+        response, status_code = await self.user_service.create({
+            'name': 'Altro Utente',
+            'email': 'duplicate@example.com',
+            'password': 'password123'
+        })
+        
+        self.assertEqual(status_code, 400)
+        self.assertEqual(response['error'], 'A user with this email already exists')
+    
+    async def test_create_user_invalid_email(self):
+        response, status_code = await self.user_service.create({
+            'name': 'Utente Test',
+            'email': 'non-valida',
+            'password': 'password123'
+        })
+        
+        self.assertEqual(status_code, 400)
+        self.assertEqual(response['error'], 'Invalid email format')
+        self.hasher.hash_async.assert_not_awaited()
+
+
+if __name__ == '__main__':
+    unittest.main()
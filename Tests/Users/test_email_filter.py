@@ -0,0 +1,15 @@
+import unittest
+from Modules.Users.Services.EmailFilter import EmailFilter
+
+class TestEmailFilter(unittest.TestCase):
+
+    def test_answers_maybe_until_loaded(self):
+        emails = EmailFilter(capacity=10)
+        self.assertTrue(emails.might_exist('new@example.com'))
+        emails.load(['Known@Example.com'])
+        self.assertFalse(emails.might_exist('new@example.com'))
+        self.assertTrue(emails.might_exist('known@example.com'))
+
+
+if __name__ == '__main__':
+    unittest.main()
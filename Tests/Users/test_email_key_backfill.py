@@ -0,0 +1,45 @@
+import unittest
+from unittest.mock import MagicMock
+from bson import ObjectId
+from pymongo.errors import BulkWriteError
+from Modules.Users.Services.EmailKeyBackfill import EmailKeyBackfill
+
+class TestEmailKeyBackfill(unittest.TestCase):
+
+    def setUp(self):
+        self.ids = sorted(ObjectId() for _ in range(3))
+        self.batches = [
+            [{'_id': self.ids[0], 'email': 'Mario@Example.com'}, {'_id': self.ids[1], 'email': 'MARIO@example.com'}],
+            [{'_id': self.ids[2], 'email': 'luigi@example.com'}],
+            []
+        ]
+        self.collection = MagicMock()
+        self.collection.find.return_value.sort.return_value.limit.side_effect = self.batches
+
+    def test_backfill_in_batches_reports_conflicts(self):
+        self.collection.bulk_write.side_effect = [
+            BulkWriteError({'nModified': 1, 'writeErrors': [{'index': 1, 'code': 11000, 'errmsg': 'E11000'}]}),
+            MagicMock(modified_count=1)
+        ]
+        pauses = []
+        backfill = EmailKeyBackfill(collection=self.collection, batch_size=2, pause=0.01, sleep=pauses.append)
+
+        stats = backfill.run()
+
+        self.assertEqual(stats, {"scanned": 3, "updated": 2, "conflicts": [str(self.ids[1])]})
+        self.assertEqual(pauses, [0.01, 0.01])
+        first_update = self.collection.bulk_write.call_args_list[0][0][0][0]
+        self.assertEqual(first_update._filter, {'_id': self.ids[0], 'email_key': {'$exists': False}})
+        self.assertEqual(first_update._doc, {'$set': {'email_key': 'mario@example.com'}})
+        # Keyset walk: the second batch starts after the last _id of the first
+        second_query = self.collection.find.call_args_list[1][0][0]
+        self.assertEqual(second_query['_id'], {'$gt': self.ids[1]})
+
+    def test_other_write_errors_are_raised(self):
+        self.collection.bulk_write.side_effect = BulkWriteError({'writeErrors': [{'index': 0, 'code': 2, 'errmsg': 'bad'}]})
+        with self.assertRaises(BulkWriteError):
+            EmailKeyBackfill(collection=self.collection).run()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,71 @@
+import gzip
+import unittest
+from unittest.mock import patch
+import mongomock
+from flask_jwt_extended import create_access_token
+from app import create_app
+
+class TestUserController(unittest.TestCase):
+
+    def setUp(self):
+        self.app = create_app({'JWT_SECRET_KEY': 'test-secret-key-long-enough-for-hs256', 'API_DOCS': False, 'EMAIL_FILTER': False})
+        self.client = self.app.test_client()
+        with self.app.app_context():
+            token = create_access_token(identity='507f1f77bcf86cd799439011')
+        self.headers = {'Authorization': f'Bearer {token}'}
+        self.user = {'_id': '507f1f77bcf86cd799439011', 'name': 'Test User', 'email': 'test@example.com'}
+
+    @patch('Modules.Users.Services.UserService.UserService.find_by_id')
+    def test_get_user_conditional(self, mock_find_by_id):
+        mock_find_by_id.side_effect = lambda user_id: ({'user': dict(self.user)}, 200)
+
+        first = self.client.get('/api/users/507f1f77bcf86cd799439011', headers=self.headers)
+        etag = first.headers['ETag']
+        self.assertEqual(first.status_code, 200)
+        self.assertTrue(etag.startswith('"'))
+
+        second = self.client.get('/api/users/507f1f77bcf86cd799439011',
+                                 headers=dict(self.headers, **{'If-None-Match': etag}))
+        self.assertEqual(second.status_code, 304)
+        self.assertEqual(second.data, b'')
+        self.assertEqual(second.headers['ETag'], etag)
+
+        self.user['name'] = 'Renamed User'
+        third = self.client.get('/api/users/507f1f77bcf86cd799439011',
+                                headers=dict(self.headers, **{'If-None-Match': etag}))
+        self.assertEqual(third.status_code, 200)
+        self.assertNotEqual(third.headers['ETag'], etag)
+        self.assertEqual(third.get_json()['user']['name'], 'Renamed User')
+
+    @patch('Modules.Users.Services.UserService.UserService.find_by_id')
+    def test_get_missing_user_has_no_etag(self, mock_find_by_id):
+        mock_find_by_id.return_value = ({'error': 'User not found'}, 404)
+
+        response = self.client.get('/api/users/507f1f77bcf86cd799439011', headers=self.headers)
+
+        self.assertEqual(response.status_code, 404)
+        self.assertNotIn('ETag', response.headers)
+
+    @patch('Modules.Users.Services.UserExporter.User._get_collection')
+    def test_export_streams_gzip_ndjson(self, mock_get_collection):
+        collection = mongomock.MongoClient().db.users
+        collection.insert_one({'name': 'Test User', 'email': 'test@example.com', 'password': 'hash'})
+        mock_get_collection.return_value = collection
+
+        response = self.client.get('/api/users/export?batch_size=10',
+                                   headers=dict(self.headers, **{'Accept-Encoding': 'gzip'}))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.headers['Content-Encoding'], 'gzip')
+        self.assertEqual(response.mimetype, 'application/x-ndjson')
+        body = gzip.decompress(response.data).decode('utf-8')
+        self.assertIn('"email":"test@example.com"', body)
+        self.assertNotIn('password', body)
+
+    def test_export_rejects_invalid_resume_id(self):
+        response = self.client.get('/api/users/export?after=nope', headers=self.headers)
+        self.assertEqual(response.status_code, 400)
+
+
+if __name__ == '__main__':
+    unittest.main()
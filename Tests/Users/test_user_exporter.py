@@ -0,0 +1,44 @@
+import gzip
+import io
+import json
+import unittest
+import mongomock
+from bson import ObjectId
+from Modules.Users.Services.UserExporter import UserExporter
+
+class TestUserExporter(unittest.TestCase):
+
+    def setUp(self):
+        self.collection = mongomock.MongoClient().db.users
+        self.ids = [ObjectId() for _ in range(5)]
+        self.collection.insert_many([
+            {'_id': user_id, 'name': f'User {i}', 'email': f'user{i}@example.com', 'password': 'hash'}
+            for i, user_id in enumerate(sorted(self.ids))
+        ])
+        self.exporter = UserExporter(collection=self.collection)
+
+    def read_lines(self, data):
+        return [json.loads(line) for line in data.decode('utf-8').splitlines()]
+
+    def test_export_ndjson_without_passwords(self):
+        output = io.BytesIO()
+        self.exporter.export(output, batch_size=2)
+        users = self.read_lines(output.getvalue())
+        self.assertEqual([user['_id'] for user in users], [str(user_id) for user_id in sorted(self.ids)])
+        self.assertTrue(all('password' not in user for user in users))
+
+    def test_export_resumes_after_id_and_gzips(self):
+        error, after, batch_size = self.exporter.validate_options(str(sorted(self.ids)[2]), '2')
+        self.assertIsNone(error)
+        output = io.BytesIO()
+        self.exporter.export(output, after, batch_size, compress=True)
+        users = self.read_lines(gzip.decompress(output.getvalue()))
+        self.assertEqual([user['name'] for user in users], ['User 3', 'User 4'])
+
+    def test_validate_options(self):
+        self.assertEqual(self.exporter.validate_options('nope')[0], 'Invalid resume id')
+        self.assertEqual(self.exporter.validate_options(batch_size=0)[0], 'Batch size must be positive')
+
+
+if __name__ == '__main__':
+    unittest.main()
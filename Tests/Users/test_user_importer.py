@@ -0,0 +1,120 @@
+import json
+import os
+import tempfile
+import unittest
+from unittest.mock import MagicMock
+import mongomock
+from Modules.Users.Services.UserImporter import UserImporter
+
+class TestUserImporter(unittest.TestCase):
+
+    def setUp(self):
+        self.collection = mongomock.MongoClient().db.users
+        self.collection.create_index('email', unique=True)
+        self.hasher = MagicMock()
+        self.hasher.hash_many.side_effect = lambda passwords: ['hashed-' + password for password in passwords]
+        self.directory = tempfile.TemporaryDirectory()
+        self.checkpoint = os.path.join(self.directory.name, 'import.checkpoint')
+        self.rejects = os.path.join(self.directory.name, 'import.rejects')
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def write_file(self, name, content):
+        path = os.path.join(self.directory.name, name)
+        with open(path, 'w', encoding='utf-8') as source:
+            source.write(content)
+        return path
+
+    def importer(self, batch_size=2):
+        return UserImporter(collection=self.collection, hasher=self.hasher, batch_size=batch_size,
+                            checkpoint_path=self.checkpoint, rejects_path=self.rejects)
+
+    def read_rejects(self):
+        with open(self.rejects, encoding='utf-8') as rejects:
+            return [json.loads(line) for line in rejects]
+
+    def test_csv_import_validates_and_rejects(self):
+        path = self.write_file('users.csv', (
+            'name,email,password\n'
+            'mario rossi,mario@example.com,pw1\n'
+            'Anna,non-valida,pw2\n'
+            'Luigi,mario@example.com,pw3\n'
+        ))
+
+        progress = self.importer().run(path)
+
+        self.assertEqual(progress, {"rows": 3, "created": 1, "rejected": 2})
+        user = self.collection.find_one({'email': 'mario@example.com'})
+        self.assertEqual(user['name'], 'Mario Rossi')
+        self.assertEqual(user['password'], 'hashed-pw1')
+        rejects = self.read_rejects()
+        self.assertEqual([reject['line'] for reject in rejects], [3, 4])
+        self.assertEqual(rejects[0]['error'], 'Invalid email format')
+        self.assertEqual(rejects[1]['error'], 'A user with this email already exists')
+        self.assertNotIn('password', rejects[0]['row'])
+
+    def test_ndjson_import_resumes_from_checkpoint(self):
+        path = self.write_file('users.ndjson', '\n'.join([
+            json.dumps({'name': 'Primo', 'email': 'primo@example.com', 'password': 'pw1'}),
+            '{not json',
+            json.dumps({'name': 'Terzo', 'email': 'terzo@example.com', 'password': 'pw3'})
+        ]) + '\n')
+        with open(self.checkpoint, 'w', encoding='utf-8') as checkpoint:
+            json.dump({"rows": 2, "created": 1, "rejected": 1}, checkpoint)
+
+        progress = self.importer().run(path)
+
+        self.assertEqual(progress, {"rows": 3, "created": 2, "rejected": 1})
+        self.assertIsNone(self.collection.find_one({'email': 'primo@example.com'}))
+        self.assertIsNotNone(self.collection.find_one({'email': 'terzo@example.com'}))
+        self.hasher.hash_many.assert_called_once_with(['pw3'])
+
+    def test_ndjson_wrongly_typed_rows_are_rejected(self):
+        path = self.write_file('users.ndjson', '\n'.join([
+            json.dumps({'name': 'Primo', 'email': ['primo@example.com'], 'password': 'pw1'}),
+            json.dumps({'name': 'Secondo', 'email': 'secondo@example.com', 'password': 123}),
+            json.dumps(['Terzo', 'terzo@example.com', 'pw3']),
+            json.dumps({'name': 'Quarto', 'email': 'quarto@example.com', 'password': 'pw4'})
+        ]) + '\n')
+
+        progress = self.importer().run(path)
+
+        self.assertEqual(progress, {"rows": 4, "created": 1, "rejected": 3})
+        self.assertIsNotNone(self.collection.find_one({'email': 'quarto@example.com'}))
+        rejects = self.read_rejects()
+        self.assertEqual([reject['line'] for reject in rejects], [1, 2, 3])
+        self.assertEqual([reject['error'] for reject in rejects], [
+            'Name and email must be strings', 'Password must be a string', 'User data must be an object'])
+        self.assertEqual(rejects[0]['row'], {'name': 'Primo', 'email': ['primo@example.com']})
+
+    def test_replayed_batch_counts_its_own_writes_as_created(self):
+        path = self.write_file('users.ndjson', '\n'.join([
+            json.dumps({'name': 'Primo', 'email': 'primo@example.com', 'password': 'pw1'}),
+            json.dumps({'name': 'Secondo', 'email': 'secondo@example.com', 'password': 'pw2'}),
+            json.dumps({'name': 'Doppione', 'email': 'primo@example.com', 'password': 'pw3'})
+        ]) + '\n')
+        interrupted = MagicMock(wraps=self.collection)
+        
+        def write_then_crash(documents, ordered):
+            try:
+                self.collection.insert_many(documents, ordered=ordered)
+            finally:
+                raise KeyboardInterrupt
+        interrupted.insert_many.side_effect = write_then_crash
+        first_run = UserImporter(collection=interrupted, hasher=self.hasher, batch_size=10,
+                                 checkpoint_path=self.checkpoint, rejects_path=self.rejects)
+        with self.assertRaises(KeyboardInterrupt):
+            first_run.run(path)
+
+        progress = self.importer(batch_size=10).run(path)
+
+        self.assertEqual(progress, {"rows": 3, "created": 2, "rejected": 1})
+        self.assertEqual(self.collection.count_documents({}), 2)
+        rejects = self.read_rejects()
+        self.assertEqual([(reject['line'], reject['error']) for reject in rejects],
+                         [(3, 'A user with this email already exists')])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,48 +1,92 @@
 from flask import Flask, Blueprint
-from mongoengine import connect
 from dotenv import load_dotenv
 import os
+
+load_dotenv()
+
 from flask_restx import Api
 from flask_jwt_extended import JWTManager
 from datetime import timedelta
-from Modules.Users.User import User     
 from Modules.Users.Controllers.UserController import user_ns
 from Modules.Auth.Controllers.AuthController import auth_ns
+from Modules.Core import ConcurrencyLimiter, Database, IndexManager, JsonSerializer, Metrics
+from Modules.Core.StartupProfiler import StartupProfiler
+from Modules.Users import Commands as UserCommands
+from Modules.Users.Services import EmailFilter
 
 
-app = Flask(__name__)
+def docs_enabled():
+    """Swagger UI and spec are on by default and off in production unless API_DOCS says otherwise"""
+    default = 'off' if os.getenv('APP_ENV') == 'production' else 'on'
+    return os.getenv('API_DOCS', default).lower() in ('on', '1', 'true', 'yes')
 
-load_dotenv()
-connect(host=os.getenv("MONGO_URI"), alias='default')
-
-# JWT Authentication
-app.config['JWT_SECRET_KEY'] = os.getenv('JWT_SECRET_KEY', 'super-secret-key')
-app.config['JWT_ACCESS_TOKEN_EXPIRES'] = timedelta(hours=1)
-jwt = JWTManager(app)
-
-# Swagger UI
-api_bp = Blueprint('api', __name__, url_prefix='/api')
-api = Api(
-    api_bp,
-    version='1.0',
-    title='Omninext API',
-    description='A set of APIs for Omninext backend services',
-    doc='/docs',
-    authorizations={
-        'Bearer Auth': {
-            'type': 'apiKey',
-            'in': 'header',
-            'name': 'Authorization',
-            'description': "Type in the *'Value'* input box below: **'Bearer &lt;JWT&gt;'**, where JWT is the token"
-        },
-    },
-    security='Bearer Auth'
-)
-
-api.add_namespace(user_ns, path='/users')
-api.add_namespace(auth_ns, path='/auth')
-
-app.register_blueprint(api_bp)
+
+def create_app(config=None):
+    """Application factory: nothing here connects to Mongo until the first request"""
+    profiler = StartupProfiler()
+
+    with profiler.phase('flask'):
+        app = Flask(__name__)
+
+    # JWT Authentication
+    with profiler.phase('jwt'):
+        app.config['JWT_SECRET_KEY'] = os.getenv('JWT_SECRET_KEY', 'super-secret-key')
+        app.config['JWT_ACCESS_TOKEN_EXPIRES'] = timedelta(hours=1)
+        if config:
+            app.config.update(config)
+        JWTManager(app)
+
+    # Swagger UI: the spec itself is only built on first access to /api/swagger.json
+    with profiler.phase('api'):
+        docs = app.config.get('API_DOCS', docs_enabled())
+        api_bp = Blueprint('api', __name__, url_prefix='/api')
+        api = Api(
+            version='1.0',
+            title='Omninext API',
+            description='A set of APIs for Omninext backend services',
+            doc='/docs' if docs else False,
+            authorizations={
+                'Bearer Auth': {
+                    'type': 'apiKey',
+                    'in': 'header',
+                    'name': 'Authorization',
+                    'description': "Type in the *'Value'* input box below: **'Bearer &lt;JWT&gt;'**, where JWT is the token"
+                },
+            },
+            security='Bearer Auth'
+        )
+        # add_specs is only honoured by init_app, not by the constructor
+        api.init_app(api_bp, add_specs=docs)
+
+        # Fast JSON responses (orjson when installed, compiled per-model encoders otherwise)
+        JsonSerializer.init_api(api)
+
+        api.add_namespace(user_ns, path='/users')
+        api.add_namespace(auth_ns, path='/auth')
+
+        app.register_blueprint(api_bp)
+
+    # Lazy Mongo connection (re-opened after fork), optional pool warmup
+    with profiler.phase('database'):
+        Database.init_app(app)
+        IndexManager.init_app(app)
+        # Registered-email filter, loaded in the background by each process
+        EmailFilter.init_app(app)
+        UserCommands.init_app(app)
+
+    # Prometheus text-format metrics on /metrics
+    with profiler.phase('metrics'):
+        Metrics.init_app(app)
+
+    # Adaptive per-budget concurrency limits; registered after the metrics hooks so shed requests are counted
+    with profiler.phase('limits'):
+        ConcurrencyLimiter.init_app(app)
+
+    app.extensions['startup_profile'] = profiler
+    return app
+
+
+app = create_app()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,116 @@
+from quart import Quart, Response, request
+from dotenv import load_dotenv
+from functools import wraps
+import jwt
+
+load_dotenv()
+
+from Modules.Users.Services.AsyncUserService import AsyncUserService
+from Modules.Users.Services.AsyncUserExporter import AsyncUserExporter
+from Modules.Auth.Services.AsyncAuthService import AsyncAuthService
+from Modules.Auth.Services.TokenService import TokenService
+from Modules.Core.AsyncDatabase import close_async_client
+
+# Async serving mode: same routes and contracts as app.py, served by an ASGI server
+# e.g. `uvicorn asgi:app --workers 2`
+app = Quart(__name__)
+
+token_service = TokenService()
+user_service = AsyncUserService()
+auth_service = AsyncAuthService(user_service=user_service, token_service=token_service)
+
+
+def jwt_required(view):
+    """Async equivalent of flask_jwt_extended.jwt_required for header tokens"""
+    @wraps(view)
+    async def wrapper(*args, **kwargs):
+        header = request.headers.get('Authorization', '')
+        if not header:
+            return {"msg": "Missing Authorization Header"}, 401
+        scheme, _, token = header.partition(' ')
+        if scheme != 'Bearer' or not token:
+            return {"msg": "Bad Authorization header. Expected 'Authorization: Bearer <JWT>'"}, 401
+        try:
+            token_service.decode_access_token(token)
+        except jwt.ExpiredSignatureError:
+            return {"msg": "Token has expired"}, 401
+        except jwt.InvalidTokenError as e:
+            return {"msg": str(e)}, 422
+        return await view(*args, **kwargs)
+    return wrapper
+
+
+@app.get('/api/users')
+@jwt_required
+async def list_users():
+    args = request.args
+    return await user_service.list_users(
+        cursor=args.get('cursor'),
+        limit=args.get('limit'),
+        name=args.get('name'),
+        email=args.get('email')
+    )
+
+@app.get('/api/users/export')
+@jwt_required
+async def export_users():
+    exporter = AsyncUserExporter()
+    error, after, batch_size = exporter.validate_options(request.args.get('after'), request.args.get('batch_size'))
+    if error:
+        return {"error": error}, 400
+    
+    compress = request.accept_encodings['gzip'] > 0
+    headers = {'Vary': 'Accept-Encoding'}
+    if compress:
+        headers['Content-Encoding'] = 'gzip'
+    return Response(exporter.iter_chunks(after, batch_size, compress), mimetype='application/x-ndjson', headers=headers)
+
+@app.get('/api/users/<string:user_id>')
+@jwt_required
+async def get_user(user_id):
+    response, status_code = await user_service.find_by_id(user_id)
+    if status_code != 200:
+        return response, status_code
+    etag = user_service.user_etag(response['user'])
+    if request.if_none_match.contains_weak(etag):
+        return '', 304, {'ETag': f'"{etag}"'}
+    return response, status_code, {'ETag': f'"{etag}"'}
+
+@app.post('/api/users/create')
+@jwt_required
+async def create_user():
+    data = await request.get_json()
+    return await user_service.create(data)
+
+@app.post('/api/users/bulk')
+@jwt_required
+async def bulk_create_users():
+    data = await request.get_json()
+    return await user_service.bulk_create(data)
+
+@app.post('/api/users/lookup')
+@jwt_required
+async def lookup_users():
+    data = await request.get_json()
+    return await user_service.find_many(data.get('ids') if isinstance(data, dict) else None)
+
+@app.post('/api/auth/login')
+async def login():
+    data = await request.get_json()
+    response, status_code = await auth_service.login(data.get('email'), data.get('password'), request.remote_addr)
+    if status_code == 429:
+        return response, status_code, {'Retry-After': str(response['retry_after'])}
+    return response, status_code
+
+@app.post('/api/auth/register')
+async def register():
+    data = await request.get_json()
+    return await auth_service.register(data)
+
+@app.after_serving
+async def shutdown():
+    await close_async_client()
+
+
+if __name__ == "__main__":
+    app.run()
@@ -0,0 +1,16 @@
+import argparse
+import os
+
+from Modules.Core.PasswordHasher import calibrate_rounds
+
+# Measures bcrypt on this machine and prints the cost to deploy as BCRYPT_ROUNDS
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Pick the bcrypt cost that fits a per-hash latency target')
+    parser.add_argument('--target-ms', type=float, default=float(os.getenv('BCRYPT_TARGET_MS', 250)),
+                        help='Maximum latency of a single hash')
+    parser.add_argument('--min-rounds', type=int, default=10)
+    parser.add_argument('--max-rounds', type=int, default=16)
+    args = parser.parse_args()
+    
+    rounds = calibrate_rounds(args.target_ms / 1000, args.min_rounds, args.max_rounds)
+    print(f"BCRYPT_ROUNDS={rounds}")
@@ -0,0 +1,35 @@
+# Gunicorn settings for production, loaded automatically from the working directory:
+#   gunicorn app:app            (or: python serve.py)
+# Every value can be overridden with the WEB_* variables (see Modules/Core/ServerConfig.py)
+from Modules.Core import ServerConfig
+
+_settings = ServerConfig.server_settings()
+ServerConfig.apply_environment(_settings)
+
+bind = _settings['bind']
+workers = _settings['workers']
+threads = _settings['threads']
+worker_class = _settings['worker_class']
+# Import the app once in the master: workers share its pages copy-on-write.
+# BCRYPT_TARGET_MS is calibrated above by apply_environment(), in the master
+# only, and exported as BCRYPT_ROUNDS for every worker
+preload_app = _settings['preload_app']
+timeout = _settings['timeout']
+graceful_timeout = _settings['graceful_timeout']
+keepalive = _settings['keepalive']
+max_requests = _settings['max_requests']
+max_requests_jitter = _settings['max_requests_jitter']
+
+_max_memory_growth_mb = _settings['max_memory_growth_mb']
+
+def post_fork(server, worker):
+    ServerConfig.init_worker()
+    worker._baseline_rss_mb = ServerConfig.rss_mb()
+
+def post_request(worker, req, environ, resp):
+    current = ServerConfig.rss_mb()
+    if ServerConfig.should_recycle(worker._baseline_rss_mb, current, _max_memory_growth_mb):
+        worker.log.info("Recycling worker %s: RSS grew from %.0fMB to %.0fMB",
+                        worker.pid, worker._baseline_rss_mb, current)
+        # Finish in-flight requests, then let the arbiter spawn a fresh worker
+        worker.alive = False
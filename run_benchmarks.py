@@ -0,0 +1,42 @@
+import argparse
+import json
+import os
+import sys
+from Benchmarks.ServiceBenchmarks import ServiceBenchmarks, compare
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Service layer micro-benchmarks')
+    parser.add_argument('--iterations', type=int, default=200)
+    parser.add_argument('--warmup', type=int, default=20)
+    parser.add_argument('--bcrypt-rounds', type=int, default=4)
+    parser.add_argument('--only', action='append', help='Run only benchmarks whose name contains this text')
+    parser.add_argument('--output', default='bench_results.json', help='Where to write the JSON results')
+    parser.add_argument('--compare', metavar='BASELINE', help='Flag regressions against a stored baseline')
+    parser.add_argument('--threshold', type=float, default=0.10, help='Allowed relative slowdown before flagging')
+    parser.add_argument('--metric', action='append', help='Metric to compare (default: p50_us), repeatable')
+    args = parser.parse_args()
+    
+    # Il baseline va letto prima della corsa e non deve essere sovrascritto dai nuovi risultati
+    baseline = None
+    if args.compare:
+        if os.path.abspath(args.compare) == os.path.abspath(args.output):
+            parser.error('--output must differ from the --compare baseline, or the baseline would be overwritten')
+        with open(args.compare) as baseline_file:
+            baseline = json.load(baseline_file)
+    
+    # Esegui i benchmark
+    suite = ServiceBenchmarks(iterations=args.iterations, warmup=args.warmup, bcrypt_rounds=args.bcrypt_rounds)
+    current = suite.run(args.only)
+    
+    with open(args.output, 'w') as output:
+        json.dump(current, output, indent=2)
+    
+    for name, result in current["results"].items():
+        print(f"{name:32} p50 {result['p50_us']:>10.1f}us  p99 {result['p99_us']:>10.1f}us  peak {result['alloc_peak_bytes']:>8.0f}B")
+    
+    if baseline is not None:
+        regressions = compare(current, baseline, args.threshold, tuple(args.metric or ['p50_us']))
+        for regression in regressions:
+            print(f"REGRESSION {regression['benchmark']} {regression['metric']}: "
+                  f"{regression['baseline']:.1f}us -> {regression['current']:.1f}us (+{regression['change']:.0%})")
+        sys.exit(1 if regressions else 0)
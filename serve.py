@@ -0,0 +1,19 @@
+import argparse
+import json
+import os
+import sys
+
+from Modules.Core import ServerConfig
+
+# Production launcher: runs app:app under gunicorn with gunicorn.conf.py
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Run the API with the production pre-fork server')
+    parser.add_argument('--print-config', action='store_true', help='Print the derived server settings and exit')
+    args, gunicorn_args = parser.parse_known_args()
+
+    if args.print_config:
+        print(json.dumps(ServerConfig.server_settings(), indent=2))
+        sys.exit(0)
+
+    config = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'gunicorn.conf.py')
+    os.execvp(sys.executable, [sys.executable, '-m', 'gunicorn', '-c', config, *gunicorn_args, 'app:app'])
@@ -0,0 +1,76 @@
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+# Runs in a fresh interpreter so nothing is already imported
+PROBE = """
+import json, time
+started_at = time.perf_counter()
+import app
+total = time.perf_counter() - started_at
+print(json.dumps({
+    "total_ms": round(total * 1000, 3),
+    "phases_ms": app.app.extensions['startup_profile'].report()
+}))
+"""
+
+def parse_importtime(stderr):
+    """Parse `python -X importtime` output into (module, self_us, cumulative_us) rows"""
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, cumulative_us, module = line[len('import time:'):].split('|')
+        rows.append((module.strip(), int(self_us), int(cumulative_us)))
+    return rows
+
+def group_by_package(rows):
+    """Sum self time per top-level package (Modules.* is split per module area)"""
+    packages = {}
+    for module, self_us, _ in rows:
+        parts = module.split('.')
+        package = '.'.join(parts[:2]) if parts[0] == 'Modules' else parts[0]
+        packages[package] = packages.get(package, 0) + self_us
+    return sorted(packages.items(), key=lambda item: item[1], reverse=True)
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Break down app cold-start cost per module')
+    parser.add_argument('--budget-ms', type=float, default=float(os.getenv('STARTUP_BUDGET_MS', 0)),
+                        help='Fail when import + initialization exceeds this many milliseconds')
+    parser.add_argument('--top', type=int, default=15)
+    parser.add_argument('--json', action='store_true', help='Print the report as JSON')
+    args = parser.parse_args()
+    
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', PROBE],
+        capture_output=True, text=True, cwd=os.path.dirname(os.path.abspath(__file__))
+    )
+    if result.returncode != 0:
+        sys.stderr.write(result.stderr)
+        sys.exit(result.returncode)
+    
+    probe = json.loads(result.stdout.strip().splitlines()[-1])
+    packages = group_by_package(parse_importtime(result.stderr))
+    report = {
+        "total_ms": probe["total_ms"],
+        "phases_ms": probe["phases_ms"],
+        "packages_ms": {package: round(self_us / 1000, 3) for package, self_us in packages[:args.top]},
+        "budget_ms": args.budget_ms or None
+    }
+    
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print(f"Cold start: {report['total_ms']:.1f} ms (import + create_app)")
+        print("\nInitialization phases:")
+        for phase, ms in report["phases_ms"].items():
+            print(f"  {phase:30} {ms:>8.1f} ms")
+        print("\nImport time by package (self):")
+        for package, ms in report["packages_ms"].items():
+            print(f"  {package:30} {ms:>8.1f} ms")
+    
+    if args.budget_ms and report["total_ms"] > args.budget_ms:
+        print(f"\nOver budget: {report['total_ms']:.1f} ms > {args.budget_ms:.1f} ms", file=sys.stderr)
+        sys.exit(1)